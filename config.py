@@ -6,7 +6,7 @@ import os
 import json
 import configparser
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Tuple
 
 
 class ConfigManager:
@@ -31,6 +31,8 @@ class ConfigManager:
             },
             'screenshot': {
                 'keep_capture_region': 'false',
+                # 截图时在鼠标旁显示坐标（需要鼠标跟踪；高回报率鼠标下关闭可减少重绘）
+                'show_cursor_pos': 'true',
             },
             'hook': {
                 'enabled': 'false',
@@ -152,6 +154,14 @@ class ConfigManager:
         self.config[section][key] = value
         self.save_config()
     
+    def set_many(self, items: Iterable[Tuple[str, str, str]]) -> None:
+        """批量设置配置值（section, key, value），全部写入后只保存一次文件"""
+        for section, key, value in items:
+            if section not in self.config:
+                self.config[section] = {}
+            self.config[section][key] = value
+        self.save_config()
+    
     def get_bool(self, section: str, key: str, default: bool = False) -> bool:
         """获取布尔值配置"""
         value = self.get(section, key, str(default)).lower()
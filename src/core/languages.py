@@ -9,6 +9,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional
 
 
@@ -124,6 +125,7 @@ def display_name_for_key(key: str) -> str:
     return lang.display_name if lang else (key or "")
 
 
+@lru_cache(maxsize=128)
 def key_for_display_name(display_name: str) -> str:
     """给定 UI 展示名，返回规范化 key。未知则尝试 normalize。"""
     if not display_name:
@@ -133,10 +135,13 @@ def key_for_display_name(display_name: str) -> str:
     return normalize_lang_key(display_name)
 
 
+@lru_cache(maxsize=128)
 def normalize_lang_key(value: str) -> str:
     """
     把各种输入（配置值/旧码/显示名）规范化为 key：
     - en/zh-CN/zh-TW/...
+
+    纯函数且输入种类很少（约 20 个），结果按参数缓存。
     """
     if not value:
         return "zh-CN"
@@ -25,6 +25,9 @@ class LanguageManager:
         self._updating_lang_combos = False
         self._temp_source_lang = None
         self._temp_target_lang = None
+        # 下拉框最近一次停留的有效项（语言或 temp:xx），选择器取消时据此恢复
+        self._last_valid_index_source = -1
+        self._last_valid_index_target = -1
         
         # 加载语言配置
         self._load_language_config()
@@ -130,6 +133,7 @@ class LanguageManager:
             data = combo.currentData()
         except Exception:
             data = None
+        self.remember_lang_combo_index(combo, for_source=True)
 
         # slot 5: 显示更多…
         if data == "show_more":
@@ -162,6 +166,7 @@ class LanguageManager:
             data = combo.currentData()
         except Exception:
             data = None
+        self.remember_lang_combo_index(combo, for_source=False)
 
         if data == "show_more":
             if hasattr(main_window, "_open_language_picker"):
@@ -348,6 +353,48 @@ class LanguageManager:
             apply_selection(target_combo, temp_key=self._temp_target_lang, desired_key=tgt_key)
         finally:
             self._updating_lang_combos = False
+        self.remember_lang_combo_index(source_combo, for_source=True)
+        self.remember_lang_combo_index(target_combo, for_source=False)
+
+    @staticmethod
+    def _is_valid_lang_item(data) -> bool:
+        """下拉框项是否为有效语言（快捷槽位语言或已设置的临时语言）"""
+        if not isinstance(data, str) or not data or data == "show_more":
+            return False
+        return data != "temp:"
+
+    def remember_lang_combo_index(self, combo: QComboBox, *, for_source: bool) -> None:
+        """记录下拉框当前停留的有效项下标（“显示更多…”等非语言项不记录）"""
+        try:
+            index = combo.currentIndex()
+            if index < 0 or not self._is_valid_lang_item(combo.itemData(index)):
+                return
+        except Exception:
+            return
+        if for_source:
+            self._last_valid_index_source = index
+        else:
+            self._last_valid_index_target = index
+
+    def restore_lang_combo_index(self, combo: QComboBox, *, for_source: bool) -> bool:
+        """
+        把下拉框静默切回最近一次的有效项（不触发 currentIndexChanged）
+        
+        Returns:
+            成功恢复返回 True；没有可用的记录时返回 False（调用方需自行重建）
+        """
+        index = self._last_valid_index_source if for_source else self._last_valid_index_target
+        try:
+            if index < 0 or index >= combo.count() or not self._is_valid_lang_item(combo.itemData(index)):
+                return False
+            combo.blockSignals(True)
+            try:
+                combo.setCurrentIndex(index)
+            finally:
+                combo.blockSignals(False)
+        except Exception:
+            return False
+        return True
 
     def reset_temp_language_on_close(self):
         """
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import sys
 import os
+import atexit
 import subprocess
 import tempfile
 import shutil
@@ -165,12 +166,135 @@ from src.core.languages import (
     normalize_lang_key,
     normalize_quick_language_keys,
 )
-from src.ui.language_picker import LanguagePickerDialog
 from src.ui.language_manager import LanguageManager
 from src.core.hook_client import HookTextThread, hook_log
 from src.utils.sqlite import TranslationReuseCache
 
 
+# 语言下拉框中不代表“可保存语言”的 itemData：显示更多… / 临时语言（temp:xxx）
+_RESERVED_LANG_DATA = frozenset({"show_more"})
+_TEMP_LANG_PREFIX = "temp:"
+
+
+def _spawn_detached_rmtree(path: Path) -> bool:
+    """
+    用系统命令（Windows: rd /s /q；其他: rm -rf）在独立进程中删除目录，不等待结束。
+    启动失败返回 False（由调用方回退到 shutil.rmtree）。
+    """
+    try:
+        if os.name == "nt":
+            subprocess.Popen(
+                ["cmd", "/c", "rd", "/s", "/q", str(path)],
+                creationflags=subprocess.DETACHED_PROCESS,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        else:
+            subprocess.Popen(
+                ["rm", "-rf", str(path)],
+                start_new_session=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        return True
+    except Exception:
+        return False
+
+
+# OCR 临时目录（与 OCRProcessor.temp_dir 一致）。关闭窗口时只改名为 .trash-<pid>-<ms>，
+# 真正的删除在进程退出时（atexit）统一进行；删不掉的目录才交给独立删除进程。
+_OCR_TEMP_DIR_NAME = "screen_translator_ocr"
+_OCR_TRASH_GLOB = _OCR_TEMP_DIR_NAME + ".trash-*"
+
+
+def _ocr_trash_dirs() -> list[Path]:
+    try:
+        return [p for p in Path(tempfile.gettempdir()).glob(_OCR_TRASH_GLOB) if p.is_dir()]
+    except Exception:
+        return []
+
+
+def _move_ocr_temp_dir_to_trash() -> None:
+    """把 OCR 临时目录改名为待删除目录（单次 rename，几乎不耗时）。"""
+    ocr_temp_dir = Path(tempfile.gettempdir()) / _OCR_TEMP_DIR_NAME
+    if not ocr_temp_dir.exists():
+        return
+    trash = ocr_temp_dir.with_name(f"{_OCR_TEMP_DIR_NAME}.trash-{os.getpid()}-{int(time.time() * 1000)}")
+    try:
+        os.rename(ocr_temp_dir, trash)
+    except OSError:
+        # 改名失败（例如文件仍被占用）：就地删除能删的部分
+        _fast_rmtree(ocr_temp_dir)
+
+
+def _fast_rmtree(path: str | os.PathLike) -> None:
+    """
+    基于 os.scandir 的递归删除（等价于 shutil.rmtree(ignore_errors=True)）。
+    DirEntry.is_dir(follow_symlinks=False) 使用目录枚举时已拿到的类型信息，省去逐项 stat。
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        entries = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            is_dir = False
+        if is_dir:
+            _fast_rmtree(entry.path)
+        else:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+def _purge_ocr_trash_dirs() -> list[Path]:
+    """删除所有 OCR 待删除目录（包括之前运行遗留的），返回仍未删掉的目录。"""
+    left = []
+    for trash in _ocr_trash_dirs():
+        _fast_rmtree(trash)
+        if trash.exists():
+            left.append(trash)
+    return left
+
+
+def _cleanup_ocr_trash_at_exit() -> None:
+    # 文件仍被占用等原因没删掉的目录，才交给独立进程在本进程退出后继续删除
+    for trash in _purge_ocr_trash_dirs():
+        _spawn_detached_rmtree(trash)
+
+
+_ocr_trash_exit_hook_registered = False
+
+
+def _register_ocr_trash_exit_hook() -> None:
+    """注册退出时的 OCR 临时目录删除（只在创建主窗口时注册一次；仅导入本模块不会注册）。"""
+    global _ocr_trash_exit_hook_registered
+    if _ocr_trash_exit_hook_registered:
+        return
+    atexit.register(_cleanup_ocr_trash_at_exit)
+    _ocr_trash_exit_hook_registered = True
+
+
+def _is_persistable_lang(value: object) -> bool:
+    """语言下拉框的 itemData 是否为可写入配置的语言 key。"""
+    return (
+        isinstance(value, str)
+        and bool(value)
+        and value not in _RESERVED_LANG_DATA
+        and not value.startswith(_TEMP_LANG_PREFIX)
+    )
+
+
 class _ShadowHoverFilter(QObject):
     def __init__(
         self,
@@ -1080,6 +1204,12 @@ class MainWindow(QMainWindow):
     def __init__(self, config_manager, ocr_processor=None, translator=None, tesseract_manager=None):
         super().__init__()
 
+        # 注册退出时删除 OCR 临时目录（同时清理之前运行遗留的待删除目录）
+        try:
+            _register_ocr_trash_exit_hook()
+        except Exception:
+            pass
+
         # 日志（用于排查“跨屏缩放是否生效”等问题）
         self.logger = logging.getLogger(__name__)
 
@@ -1113,6 +1243,7 @@ class MainWindow(QMainWindow):
             'overlay_timeout': self.config_manager.get_int('overlay', 'timeout', 10),
             'overlay_auto_hide': self.config_manager.get_bool('overlay', 'auto_hide', True),
             'keep_capture_region': self.config_manager.get_bool('screenshot', 'keep_capture_region', False),
+            'screenshot_show_cursor_pos': self.config_manager.get_bool('screenshot', 'show_cursor_pos', True),
             # 字芯颜色（用于复杂背景模式）
             'ocr_core_color': self.config_manager.get('ocr', 'core_color', '#FFFFFF'),
             # 新：颜色对话框“自定义颜色”槽位（最多 16 个，逗号分隔 #RRGGBB）
@@ -1238,6 +1369,10 @@ class MainWindow(QMainWindow):
         self._eyedropper = None
         self._locked_capture_rect: QRect | None = None
         self._locked_region_frame = None
+        # 颜色对话框“自定义颜色”槽位：内存中直接保存 QColor，仅在读写配置时做字符串转换
+        self._custom_colors_cache: list[QColor] = [
+            QColor(c) for c in self._parse_custom_colors(self.config.get("ocr_custom_colors", ""))
+        ]
         
         # 状态变量
         self.is_translating = False
@@ -1251,24 +1386,32 @@ class MainWindow(QMainWindow):
         self._translation_reuse_loading = False
         self._translation_reuse_last_query = ""
 
+        # 日志面板：突发日志先入队，由单次 QTimer 合并刷新（避免逐条触发 QTextEdit 排版/滚动）
+        self._log_queue: deque[str] = deque(maxlen=500)
+        self._log_flush_pending = False
+
         # 初始化语言管理器
         self.language_manager = LanguageManager(self.config_manager)
+        # 实际生效的源/目标语言 key 缓存（None 表示待重新计算；语言选择变化时失效）
+        self._eff_source_lang: str | None = None
+        self._eff_target_lang: str | None = None
 
         # 计算屏幕缩放因子（基于主屏幕的DPI）
         self.scale_factor = self._calculate_scale_factor()
         # 多显示器/不同缩放：记录当前屏幕并在跨屏时自动刷新 UI 缩放
         self._last_screen_name = ""
         self._screen_tracking_installed = False
-        self._scale_apply_debounce = QTimer(self)
-        self._scale_apply_debounce.setSingleShot(True)
-        self._scale_apply_debounce.timeout.connect(self._update_scale_factor_for_current_screen)
+        # 拖动窗口时 moveEvent 非常频繁：同一时间最多挂起一次缩放重算
+        self._pending_scale_recompute = False
         # 启动期：确保“每次启动都按当前屏幕计算并应用一次”
         self._startup_scale_applied = False
         # 用于后续动态调整的引用
         self._main_layout = None
         self._title_label = None
         self._open_animation_played = False
-        self._open_animation = None
+        self._open_animation = QPropertyAnimation(self, b"windowOpacity", self)
+        self._open_animation.setDuration(240)
+        self._open_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
         self._ui_effect_refs: list[object] = []
         self._main_page_card_targets: list[tuple[QWidget, int, int, int]] = []
         self._main_page_hover_filters: list[tuple[_ShadowHoverFilter, int, int, int, int, int]] = []
@@ -5040,7 +5183,9 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
 
-            self.screenshot_tool = ScreenshotTool()
+            self.screenshot_tool = ScreenshotTool(
+                show_cursor_pos=bool(self.config.get("screenshot_show_cursor_pos", True))
+            )
             self.screenshot_tool.screenshot_taken.connect(self.process_screenshot)
             
             # 初始化悬浮窗
@@ -7655,7 +7800,7 @@ class MainWindow(QMainWindow):
                 except Exception:
                     pass
                 try:
-                    result = self.screenshot_tool.grab_rect(QRect(self._locked_capture_rect))
+                    result = self.screenshot_tool.capture_rect(QRect(self._locked_capture_rect))
                 except Exception as e:
                     self.log_message(f"保留区域截图失败: {e}")
                     return
@@ -7805,17 +7950,30 @@ class MainWindow(QMainWindow):
                         self.overlay.retranslate_button.setText("重试")
                         self.overlay.progress_bar.setValue(0)
                         self.overlay.progress_label.setText("")
+                        self.overlay.invalidate_ui_state()
                     except Exception:
                         pass
                 return
 
             self.log_message(f"识别到文字:\n{ocr_result.text}")
+
+            # OCR 已完成，文字已拷出：尽早释放截图缓冲，避免翻译期间占用整幅图像内存
+            try:
+                pil_image.close()
+            except Exception:
+                pass
+            pil_image = None
+            try:
+                buffer.close()
+            except Exception:
+                pass
+            buffer = None
             
             if self.overlay:
                 try:
                     self.overlay.original_text.setPlainText(ocr_result.text)
                     # 确保显示进度条，隐藏翻译结果
-                    if hasattr(self.overlay, 'progress_container'):
+                    if getattr(self.overlay, 'progress_container', None) is not None:
                         self.overlay.progress_container.setVisible(True)
                         self.overlay.translation_text.setVisible(False)
                     self.overlay.language_label.setText("OCR 完成")
@@ -7833,6 +7991,7 @@ class MainWindow(QMainWindow):
                         self.overlay.retranslate_button.setEnabled(True)
                         self.overlay.progress_bar.setValue(0)
                         self.overlay.progress_label.setText("")
+                        self.overlay.invalidate_ui_state()
                     except Exception:
                         pass
                 return
@@ -7893,8 +8052,25 @@ class MainWindow(QMainWindow):
             return "zh-CN"
         return normalize_lang_key(key_for_display_name(str(language_name).strip()))
 
+    def _invalidate_effective_language_keys(self) -> None:
+        """语言选择/配置变化后调用：下次读取时重新计算实际生效的语言 key。"""
+        self._eff_source_lang = None
+        self._eff_target_lang = None
+
     def _get_effective_language_key(self, *, for_source: bool) -> str:
-        """返回当前翻译实际使用的语言 key"""
+        """返回当前翻译实际使用的语言 key（带缓存）"""
+        cached = self._eff_source_lang if for_source else self._eff_target_lang
+        if cached is not None:
+            return cached
+        key = self._compute_effective_language_key(for_source=for_source)
+        if for_source:
+            self._eff_source_lang = key
+        else:
+            self._eff_target_lang = key
+        return key
+
+    def _compute_effective_language_key(self, *, for_source: bool) -> str:
+        """计算当前翻译实际使用的语言 key（临时语言优先，其次为配置）"""
         # 优先使用临时语言（如果有的话）
         if for_source:
             temp_lang = self.language_manager.get_temp_language_source()
@@ -7923,6 +8099,7 @@ class MainWindow(QMainWindow):
     def _on_source_lang_combo_changed(self, index: int) -> None:
         """源语言下拉框变化处理"""
         self.language_manager.on_source_lang_combo_changed(index, self.source_lang_combo, self)
+        self._invalidate_effective_language_keys()
         try:
             self.update_translate_button_label()
         except Exception:
@@ -7931,6 +8108,7 @@ class MainWindow(QMainWindow):
     def _on_target_lang_combo_changed(self, index: int) -> None:
         """目标语言下拉框变化处理"""
         self.language_manager.on_target_lang_combo_changed(index, self.target_lang_combo, self)
+        self._invalidate_effective_language_keys()
         try:
             self.update_translate_button_label()
         except Exception:
@@ -7939,6 +8117,8 @@ class MainWindow(QMainWindow):
     def _open_language_picker(self, *, for_source: bool, slot_index: int = -1) -> None:
         """打开全语言搜索选择器，并把选择结果回填到 4 个快捷槽位。"""
         try:
+            from src.ui.language_picker import LanguagePickerDialog
+
             dlg = LanguagePickerDialog(
                 parent=self,
                 title="选择源语言" if for_source else "选择目标语言",
@@ -7946,13 +8126,17 @@ class MainWindow(QMainWindow):
             )
             items = [(l.display_name, l.key) for l in ALL_LANGUAGES]
             dlg.set_languages(items)
+            combo = self.source_lang_combo if for_source else self.target_lang_combo
             if dlg.exec() != int(QDialog.DialogCode.Accepted):
-                # 用户取消：恢复到一个有效项（避免 combo 停留在“显示更多…”）
-                self._rebuild_language_combos(apply_config_selection=True)
+                # 用户取消：切回打开选择器前的有效项（避免 combo 停留在“显示更多…”）；
+                # 没有记录时才整体重建
+                if not self.language_manager.restore_lang_combo_index(combo, for_source=for_source):
+                    self._rebuild_language_combos(apply_config_selection=True)
                 return
             picked = dlg.selected_key()
             if not picked:
-                self._rebuild_language_combos(apply_config_selection=True)
+                if not self.language_manager.restore_lang_combo_index(combo, for_source=for_source):
+                    self._rebuild_language_combos(apply_config_selection=True)
                 return
             picked_key = normalize_lang_key(str(picked))
             selected_slot = dlg.selected_slot()
@@ -7968,6 +8152,13 @@ class MainWindow(QMainWindow):
 
                 quick_source = list(self.language_manager.quick_lang_keys_source)
                 quick_target = list(self.language_manager.quick_lang_keys_target)
+                old_quick = normalize_quick_language_keys(quick_source if for_source else quick_target, desired_len=4)
+                # 替换前若处于临时语言，slot0 也要变化，只能整体重建
+                had_temp = (
+                    self.language_manager.get_temp_language_source()
+                    if for_source
+                    else self.language_manager.get_temp_language_target()
+                ) is not None
 
                 def replace_with_optional_swap(lst: list[str], slot_idx: int, new_key: str) -> list[str]:
                     # 保证长度 4
@@ -7982,6 +8173,7 @@ class MainWindow(QMainWindow):
 
                 if for_source:
                     new_quick_source = replace_with_optional_swap(quick_source, slot, picked_key)
+                    new_quick = new_quick_source
                     self.language_manager.update_quick_languages(new_quick_source, quick_target)
                     # 选中快捷槽位时：清掉临时源语言，并把当前源语言写入配置
                     self.language_manager.reset_temp_language_source()
@@ -7993,6 +8185,7 @@ class MainWindow(QMainWindow):
                         pass
                 else:
                     new_quick_target = replace_with_optional_swap(quick_target, slot, picked_key)
+                    new_quick = new_quick_target
                     self.language_manager.update_quick_languages(quick_source, new_quick_target)
                     self.language_manager.reset_temp_language_target()
                     try:
@@ -8002,15 +8195,20 @@ class MainWindow(QMainWindow):
                     except Exception:
                         pass
 
-                # 重建并选中：槽位 1-4
-                self._rebuild_language_combos(apply_config_selection=True)
-                combo = self.source_lang_combo if for_source else self.target_lang_combo
+                # 更新并选中：槽位 1-4（只有替换/交换过的槽位需要改写）
+                if had_temp:
+                    self._rebuild_language_combos(apply_config_selection=True)
+                else:
+                    for i, (old_key, new_key) in enumerate(zip(old_quick, new_quick)):
+                        if old_key != new_key:
+                            self._update_quick_slot_in_combo(combo, i, new_key)
                 combo.blockSignals(True)
                 try:
                     if combo.count() > ui_index:
                         combo.setCurrentIndex(ui_index)
                 finally:
                     combo.blockSignals(False)
+                self.language_manager.remember_lang_combo_index(combo, for_source=for_source)
 
                 self.log_message("快捷语言槽位已保存（直接替换）")
                 return
@@ -8028,13 +8226,25 @@ class MainWindow(QMainWindow):
                 combo.setCurrentIndex(0)
             finally:
                 combo.blockSignals(False)
+            self.language_manager.remember_lang_combo_index(combo, for_source=for_source)
             self.log_message("已设置临时语言（不保存到快捷槽位）")
         except Exception as e:
             self.log_message(f"打开语言选择器失败: {e}")
             self._rebuild_language_combos(apply_config_selection=True)
+        finally:
+            # 临时语言/快捷槽位/配置都可能已变化
+            self._invalidate_effective_language_keys()
 
 
 
+    def _update_quick_slot_in_combo(self, combo: QComboBox, slot_idx: int, key: str) -> None:
+        """原地改写下拉框中的单个快捷槽位（slot_idx: 0-3 -> combo index 1-4）。"""
+        ui_index = slot_idx + 1
+        if combo.count() <= ui_index:
+            return
+        combo.setItemText(ui_index, display_name_for_key(key))
+        combo.setItemData(ui_index, key)
+
     def _rebuild_language_combos(self, *, apply_config_selection: bool) -> None:
         """重建两个语言下拉框：源(自动+4槽位+更多) / 目标(4槽位+更多)。"""
         self.language_manager.rebuild_language_combos_advanced(
@@ -8057,28 +8267,24 @@ class MainWindow(QMainWindow):
     def save_language_settings(self):
         """保存语言设置"""
         # 分别处理源语言和目标语言，确保每个语言都能独立保存
+        updates: list[tuple[str, str, str]] = []
         
         # 源语言处理
         src_data = self.source_lang_combo.currentData()
-        if isinstance(src_data, str) and src_data and src_data != "show_more" and not src_data.startswith("temp:"):
+        if _is_persistable_lang(src_data):
             self.config["source_language"] = src_data
-            try:
-                self.config_manager.set("translation", "source_language", src_data)
-            except Exception as e:
-                self.logger.debug(f"保存源语言失败: {e}")
+            updates.append(("translation", "source_language", src_data))
         
         # 目标语言处理
         tgt_data = self.target_lang_combo.currentData()
-        if isinstance(tgt_data, str) and tgt_data and tgt_data != "show_more" and not tgt_data.startswith("temp:"):
+        if _is_persistable_lang(tgt_data):
             self.config["target_language"] = tgt_data
-            try:
-                self.config_manager.set("translation", "target_language", tgt_data)
-            except Exception as e:
-                self.logger.debug(f"保存目标语言失败: {e}")
+            updates.append(("translation", "target_language", tgt_data))
+        self._invalidate_effective_language_keys()
         
-        # 保存配置
+        # 保存配置（全部写入后只保存一次文件）
         try:
-            self.config_manager.save_config()
+            self.config_manager.set_many(updates)
         except Exception as e:
             self.logger.debug(f"保存配置文件失败: {e}")
         
@@ -8815,16 +9021,11 @@ class MainWindow(QMainWindow):
         except Exception:
             enabled = True
 
-        # 写回内存配置 + 配置文件
+        # 写回内存配置
         try:
             self.config["ocr_preprocess_enabled"] = bool(enabled)
         except Exception:
             pass
-        try:
-            if self.config_manager:
-                self.config_manager.set("ocr_preprocess", "enabled", "true" if enabled else "false")
-        except Exception:
-            pass
 
         # 字芯颜色（复杂背景模式使用）
         core_color = None
@@ -8840,9 +9041,13 @@ class MainWindow(QMainWindow):
             self.config["ocr_core_color"] = core_color
         except Exception:
             pass
+        # 配置文件：一次性写入
         try:
             if self.config_manager:
-                self.config_manager.set("ocr", "core_color", core_color)
+                self.config_manager.set_many([
+                    ("ocr_preprocess", "enabled", "true" if enabled else "false"),
+                    ("ocr", "core_color", core_color),
+                ])
         except Exception:
             pass
 
@@ -8879,9 +9084,11 @@ class MainWindow(QMainWindow):
         self.config['overlay_timeout'] = self.timeout_spin.value()
         self.config['overlay_auto_hide'] = self.auto_hide_check.isChecked()
         try:
-            self.config_manager.set('overlay', 'opacity', str(self.config['overlay_opacity']))
-            self.config_manager.set('overlay', 'timeout', str(self.config['overlay_timeout']))
-            self.config_manager.set('overlay', 'auto_hide', 'true' if self.config['overlay_auto_hide'] else 'false')
+            self.config_manager.set_many([
+                ('overlay', 'opacity', str(self.config['overlay_opacity'])),
+                ('overlay', 'timeout', str(self.config['overlay_timeout'])),
+                ('overlay', 'auto_hide', 'true' if self.config['overlay_auto_hide'] else 'false'),
+            ])
         except Exception:
             self.config_manager.save_config()
         
@@ -8967,7 +9174,7 @@ class MainWindow(QMainWindow):
         if re.fullmatch(r"[0-9a-fA-F]{6}", v):
             v = "#" + v
         if re.fullmatch(r"#[0-9a-fA-F]{3}", v):
-            v = "#" + "".join([c * 2 for c in v[1:]])
+            v = "#" + v[1] * 2 + v[2] * 2 + v[3] * 2
         if not re.fullmatch(r"#[0-9a-fA-F]{6}", v):
             return None
         return v.upper()
@@ -9000,31 +9207,22 @@ class MainWindow(QMainWindow):
         self.config["ocr_preprocess_enabled"] = bool(enabled)
 
         # 字芯颜色控件：仅在“复杂背景模式”下有意义
+        # 控件可能尚未创建：用 getattr 跳过缺失项，整组更新只用一个 try
+        enabled = bool(enabled)
         try:
-            if hasattr(self, "ocr_core_color_group") and self.ocr_core_color_group is not None:
-                self.ocr_core_color_group.setVisible(bool(enabled))
-        except Exception:
-            pass
-
-        try:
-            if hasattr(self, "ocr_core_color_edit"):
-                self.ocr_core_color_edit.setEnabled(bool(enabled))
-        except Exception:
-            pass
-        try:
-            if hasattr(self, "ocr_core_color_pick_btn"):
-                self.ocr_core_color_pick_btn.setEnabled(bool(enabled))
-        except Exception:
-            pass
-        try:
-            if hasattr(self, "ocr_core_color_dropper_btn"):
-                self.ocr_core_color_dropper_btn.setEnabled(bool(enabled))
-        except Exception:
-            pass
-        try:
-            if hasattr(self, "ocr_core_color_preview"):
+            group = getattr(self, "ocr_core_color_group", None)
+            if group is not None:
+                group.setVisible(enabled)
+            for name in (
+                "ocr_core_color_edit",
+                "ocr_core_color_pick_btn",
+                "ocr_core_color_dropper_btn",
                 # 预览仍可显示，但在禁用时做弱化提示
-                self.ocr_core_color_preview.setEnabled(bool(enabled))
+                "ocr_core_color_preview",
+            ):
+                w = getattr(self, name, None)
+                if w is not None:
+                    w.setEnabled(enabled)
         except Exception:
             pass
 
@@ -9041,51 +9239,36 @@ class MainWindow(QMainWindow):
                 break
         return items
 
-    def _serialize_custom_colors(self, colors: list[str]) -> str:
+    def _serialize_custom_colors(self, colors: list[QColor]) -> str:
         """将自定义颜色列表序列化为配置字符串（逗号分隔 #RRGGBB）。"""
-        out: list[str] = []
-        for c in colors or []:
-            v = self._normalize_hex_color(c)
-            if v:
-                out.append(v)
-            if len(out) >= 16:
-                break
-        return ",".join(out)
+        return ",".join(qc.name().upper() for qc in colors[:16])
 
-    def _apply_qt_custom_colors(self, colors: list[str]) -> None:
-        """把自定义颜色写入 Qt 的全局自定义颜色槽位（0~15）。"""
+    def _apply_qt_custom_colors(self) -> None:
+        """把缓存的自定义颜色写入 Qt 的全局自定义颜色槽位（0~15）。"""
         try:
-            for i, hex_c in enumerate(colors[:16]):
+            for i, qc in enumerate(self._custom_colors_cache[:16]):
                 try:
-                    QColorDialog.setCustomColor(i, QColor(hex_c))
+                    QColorDialog.setCustomColor(i, qc)
                 except Exception:
                     # 兼容某些 PyQt6 绑定差异
                     pass
         except Exception:
             pass
 
-    def _read_qt_custom_colors(self) -> list[str]:
-        """从 Qt 的全局自定义颜色槽位读取 0~15 个颜色，返回 #RRGGBB 列表。"""
-        colors: list[str] = []
+    def _read_qt_custom_colors(self) -> list[QColor]:
+        """从 Qt 的全局自定义颜色槽位读取 0~15 个有效颜色。"""
+        # Qt 固定 16 个槽位：先一次性全部读出，再在 Python 侧过滤
         try:
-            for i in range(16):
-                try:
-                    qc = QColorDialog.customColor(i)
-                except Exception:
-                    qc = None
-                try:
-                    if qc is not None and isinstance(qc, QColor) and qc.isValid():
-                        colors.append(qc.name().upper())
-                except Exception:
-                    pass
+            colors = [QColorDialog.customColor(i) for i in range(16)]
         except Exception:
-            pass
-        return colors
+            return []
+        return [qc for qc in colors if qc is not None and qc.isValid()]
 
-    def _save_ocr_custom_colors(self, colors: list[str]) -> None:
-        """保存自定义颜色槽位到配置（ocr.custom_colors）。"""
+    def _save_ocr_custom_colors(self, colors: list[QColor]) -> None:
+        """更新自定义颜色缓存，并保存到配置（ocr.custom_colors）。"""
+        self._custom_colors_cache = list(colors[:16])
         try:
-            s = self._serialize_custom_colors(colors)
+            s = self._serialize_custom_colors(self._custom_colors_cache)
             self.config["ocr_custom_colors"] = s
             if self.config_manager:
                 self.config_manager.set("ocr", "custom_colors", s)
@@ -9098,9 +9281,8 @@ class MainWindow(QMainWindow):
         qcolor = QColor(current)
 
         # 恢复上次的“自定义颜色”槽位（最多 16 个）
-        saved_custom = self._parse_custom_colors(self.config.get("ocr_custom_colors", ""))
-        if saved_custom:
-            self._apply_qt_custom_colors(saved_custom)
+        if self._custom_colors_cache:
+            self._apply_qt_custom_colors()
 
         # 关键：不要用 Windows 原生颜色对话框（它会跟随系统语言，无法由应用强制汉化）
         # 改用 Qt 自带对话框 + Qt 翻译包（见 main.py 里 installTranslator），即可显示中文按钮/标签。
@@ -9166,26 +9348,41 @@ class MainWindow(QMainWindow):
         
     def log_message(self, message):
         """记录日志消息"""
-        import datetime
         try:
             logging.info(str(message))
         except Exception:
             pass
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        lt = time.localtime()
+        timestamp = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
         log_entry = f"[{timestamp}] {message}"
 
         # 检查 log_text 属性是否存在，避免在控件创建之前调用导致错误
         if not hasattr(self, 'log_text'):
             return
-        
+
+        # 入队，50ms 内的突发日志合并为一次写入
+        self._log_queue.append(log_entry)
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            QTimer.singleShot(50, self._flush_log)
+
+    def _flush_log(self) -> None:
+        """把排队的日志一次性写入日志文本框并滚动到底部。"""
+        self._log_flush_pending = False
+        if not self._log_queue:
+            return
+        entries = list(self._log_queue)
+        self._log_queue.clear()
+
         # 添加到日志文本框（强制纯文本；允许 message 内部包含换行，显示完整内容）
         try:
             self.log_text.moveCursor(QTextCursor.MoveOperation.End)
-            self.log_text.insertPlainText(log_entry + "\n")
+            self.log_text.insertPlainText("\n".join(entries) + "\n")
         except Exception as e:
             # 兜底：append 可能会按富文本解析，因此只在异常时使用
             try:
-                self.log_text.append(log_entry)
+                for log_entry in entries:
+                    self.log_text.append(log_entry)
             except Exception:
                 pass
 
@@ -9237,11 +9434,9 @@ class MainWindow(QMainWindow):
         # 关闭时重置临时语言
         self.language_manager.reset_temp_language_on_close()
         
-        # 清理OCR临时文件目录
+        # 清理OCR临时文件目录：关闭时只改名，删除在进程退出时进行
         try:
-            ocr_temp_dir = Path(tempfile.gettempdir()) / "screen_translator_ocr"
-            if ocr_temp_dir.exists():
-                shutil.rmtree(ocr_temp_dir, ignore_errors=True)
+            _move_ocr_temp_dir_to_trash()
         except Exception:
             pass
 
@@ -9274,22 +9469,23 @@ class MainWindow(QMainWindow):
             if not self._open_animation_played:
                 self._open_animation_played = True
                 self.setWindowOpacity(0.0)
-                anim = QPropertyAnimation(self, b"windowOpacity", self)
-                anim.setDuration(240)
-                anim.setStartValue(0.0)
-                anim.setEndValue(1.0)
-                anim.setEasingCurve(QEasingCurve.Type.OutCubic)
-                self._open_animation = anim
-                anim.start()
+                self._open_animation.setStartValue(0.0)
+                self._open_animation.setEndValue(1.0)
+                self._open_animation.start()
         except Exception:
             pass
 
     def moveEvent(self, event):
         """窗口移动事件：用于拖动跨屏时自动适配缩放（节流）"""
-        try:
-            if self._scale_apply_debounce is not None:
-                # 拖动过程中会非常频繁，这里做个轻量节流
-                self._scale_apply_debounce.start(120)
-        except Exception:
-            pass
+        # 拖动过程中会非常频繁：已挂起时直接跳过，120ms 后合并执行一次
+        if not getattr(self, "_pending_scale_recompute", False):
+            self._pending_scale_recompute = True
+            try:
+                QTimer.singleShot(120, self._do_scale_recompute)
+            except Exception:
+                self._pending_scale_recompute = False
         super().moveEvent(event)
+
+    def _do_scale_recompute(self) -> None:
+        self._pending_scale_recompute = False
+        self._update_scale_factor_for_current_screen()
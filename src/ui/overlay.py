@@ -1,12 +1,194 @@
 """
 悬浮翻译窗 - 显示OCR识别和翻译结果的半透明窗口
 """
+import time
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QFrame, QApplication, QTextEdit, QProgressBar
 )
 from PyQt6.QtCore import Qt, QEvent, QTimer, QPropertyAnimation, QEasingCurve, pyqtProperty, pyqtSignal, QPoint, QRect
-from PyQt6.QtGui import QFont, QColor, QPainter, QBrush, QPen, QCursor
+from PyQt6.QtGui import QFont, QColor, QPainter, QBrush, QPen, QCursor, QGuiApplication
+
+
+# 悬浮窗静态样式表：模块级常量，避免每次构建/切换配色时重新生成字符串
+_QSS_MAIN_FRAME = """
+QFrame#mainFrame {
+    background-color: rgba(30, 30, 30, 230);
+    border: 2px solid rgba(100, 100, 100, 200);
+    border-radius: 10px;
+}
+"""
+
+_QSS_CLOSE_BUTTON = """
+QPushButton {
+    background-color: rgba(255, 100, 100, 150);
+    color: white;
+    border: none;
+    border-radius: 10px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: rgba(255, 50, 50, 200);
+}
+"""
+
+_QSS_ORIGINAL_GROUP = """
+QFrame {
+    background-color: rgba(40, 40, 40, 180);
+    border: 1px solid rgba(80, 80, 80, 150);
+    border-radius: 5px;
+    padding: 5px;
+}
+"""
+
+_QSS_ORIGINAL_TEXT = """
+QTextEdit {
+    background: rgba(30, 30, 30, 100);
+    color: #CCCCCC;
+    font-size: 11px;
+    border: 1px solid rgba(100, 100, 100, 50);
+    border-radius: 3px;
+}
+QTextEdit:focus {
+    border: 1px solid rgba(76, 175, 80, 150);
+}
+"""
+
+_QSS_TRANSLATION_GROUP = """
+QFrame {
+    background-color: rgba(50, 50, 50, 180);
+    border: 1px solid rgba(100, 100, 100, 150);
+    border-radius: 5px;
+    padding: 5px;
+}
+"""
+
+_QSS_TRANSLATION_GROUP_HOOK = """
+QFrame {
+    background-color: rgba(25, 42, 68, 210);
+    border: 1px solid rgba(77, 163, 255, 190);
+    border-radius: 5px;
+    padding: 5px;
+}
+"""
+
+_QSS_PROGRESS_BAR = """
+QProgressBar {
+    background: rgba(60, 60, 60, 150);
+    border: 1px solid rgba(100, 100, 100, 100);
+    border-radius: 3px;
+    text-align: center;
+    color: #AAAAAA;
+    font-size: 10px;
+    height: 16px;
+}
+QProgressBar::chunk {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 #4CAF50, stop:1 #8BC34A);
+    border-radius: 2px;
+}
+"""
+
+_QSS_COPY_BUTTON = """
+QPushButton {
+    background-color: rgba(76, 175, 80, 150);
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 5px 10px;
+    font-size: 10px;
+}
+QPushButton:hover {
+    background-color: rgba(76, 175, 80, 200);
+}
+"""
+
+_QSS_PIN_BUTTON = """
+QPushButton {
+    background-color: rgba(100, 100, 100, 150);
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 5px 10px;
+    font-size: 10px;
+}
+QPushButton:checked {
+    background-color: rgba(33, 150, 243, 200);
+}
+QPushButton:hover {
+    background-color: rgba(150, 150, 150, 200);
+}
+"""
+
+_QSS_RETRANSLATE_BUTTON = """
+QPushButton {
+    background-color: rgba(33, 150, 243, 150);
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 5px 10px;
+    font-size: 10px;
+}
+QPushButton:hover {
+    background-color: rgba(33, 150, 243, 200);
+}
+QPushButton:pressed {
+    background-color: rgba(25, 118, 210, 200);
+}
+"""
+
+
+# 标题字体：只构造一次（QFont 在 C++ 侧隐式共享，setFont 时复制开销很小）。
+# 只设置了字号与粗细，字体族仍跟随控件继承的应用字体解析。
+_TITLE_FONT = QFont()
+_TITLE_FONT.setPointSize(12)
+_TITLE_FONT.setBold(True)
+
+
+# 边缘缩放命中位：左/右/上/下 打包进一个 int，鼠标移动时只需一次整数比较
+_EDGE_LEFT = 1
+_EDGE_RIGHT = 2
+_EDGE_TOP = 4
+_EDGE_BOTTOM = 8
+
+
+def _hit_edges_bits(x: int, y: int, w: int, h: int, m: int) -> int:
+    """返回 (x, y) 命中的缩放边缘位掩码（_EDGE_* 的组合，0 表示未命中）"""
+    return (x <= m) | ((x >= w - m) << 1) | ((y <= m) << 2) | ((y >= h - m) << 3)
+
+
+def _decode_edges_bits(bits: int) -> tuple[bool, bool, bool, bool]:
+    """位掩码 -> (left, right, top, bottom)，仅在开始拖动时使用"""
+    return (
+        bool(bits & _EDGE_LEFT),
+        bool(bits & _EDGE_RIGHT),
+        bool(bits & _EDGE_TOP),
+        bool(bits & _EDGE_BOTTOM),
+    )
+
+
+def _cursor_shape_for_bits(bits: int):
+    left, right, top, bottom = _decode_edges_bits(bits)
+    if (left and top) or (right and bottom):
+        return Qt.CursorShape.SizeFDiagCursor
+    if (right and top) or (left and bottom):
+        return Qt.CursorShape.SizeBDiagCursor
+    if left or right:
+        return Qt.CursorShape.SizeHorCursor
+    if top or bottom:
+        return Qt.CursorShape.SizeVerCursor
+    return Qt.CursorShape.ArrowCursor
+
+
+# 16 种位组合对应的光标形状，按位掩码直接索引
+_EDGE_CURSOR_SHAPES = tuple(_cursor_shape_for_bits(b) for b in range(16))
+
+
+def _set_plain_text_if_changed(edit: QTextEdit, text: str) -> None:
+    """内容相同则跳过 setPlainText（避免 QTextEdit 重建文档并重新排版）"""
+    if edit.toPlainText() != text:
+        edit.setPlainText(text)
 
 
 class TranslationOverlay(QWidget):
@@ -17,6 +199,14 @@ class TranslationOverlay(QWidget):
     # - 文本模式：disable_preprocess=True（用户输入原样送翻译器，不做任何预处理）
     retranslate_requested = pyqtSignal(str, bool)
 
+    # eventFilter 只关心这三类鼠标事件（QEvent.Type 为 IntEnum，缓存成 int 便于快速比较）
+    _ET_MOVE = int(QEvent.Type.MouseMove)
+    _ET_PRESS = int(QEvent.Type.MouseButtonPress)
+    _ET_RELEASE = int(QEvent.Type.MouseButtonRelease)
+
+    # 翻译进度刷新的最小间隔（秒），约 10Hz
+    _PROGRESS_MIN_INTERVAL = 0.1
+
     def __init__(self):
         super().__init__()
         
@@ -37,11 +227,27 @@ class TranslationOverlay(QWidget):
         self.auto_hide = True
         # overlay 当前工作模式：ocr / text
         self._mode: str = "ocr"
+        # 由 show_*/update_* 设置的控件状态：ocr_loading / ocr_done / text_mode / retranslating / progress；
+        # None 表示未知（外部直接改过控件），下次必须完整设置
+        self._ui_state: str | None = None
         # 悬浮窗翻译文字颜色（字芯颜色）
         self.text_color = "#FFFFFF"
+        # 最近一次应用到翻译文本框的样式 (accent_mode, color)，未变化时跳过 setStyleSheet
+        self._last_applied_text_style: tuple[str, str] | None = None
         self.hide_timer = QTimer()
         self.hide_timer.timeout.connect(self.hide_overlay)
         self._accent_mode = "default"
+        # 最近一次使用的屏幕及其可用区域 (screen, availableGeometry)；屏幕可用区域变化时失效
+        self._screen_geom_cache = None
+        self._screen_geom_watched: set[int] = set()
+        # 淡入/淡出共用一个动画对象；_fade_hide_on_finish 决定结束时是否隐藏窗口
+        self._fade_anim = QPropertyAnimation(self, b"windowOpacity", self)
+        self._fade_anim.setDuration(300)  # 300毫秒
+        self._fade_anim.finished.connect(self._on_fade_finished)
+        self._fade_hide_on_finish = False
+        # 阴影画刷与区域：画刷只构造一次，区域仅在 resizeEvent 中重新计算
+        self._shadow_brush = QBrush(QColor(0, 0, 0, 50))
+        self._shadow_rect = QRect()
         
         # 初始化UI
         self.init_ui()
@@ -57,34 +263,49 @@ class TranslationOverlay(QWidget):
         self._resize_edges: tuple[bool, bool, bool, bool] = (False, False, False, False)
         self._resize_start_geom = QRect()
         self._resize_start_global = QPoint()
+        # 拖动开始时记录的最小尺寸（拖动过程中不变，避免每次鼠标移动都查询）
+        self._cached_min_w = 0
+        self._cached_min_h = 0
+        # 拖动缩放时的待应用几何 (x, y, w, h)：同一轮事件循环内只 setGeometry 一次
+        self._pending_geom: tuple[int, int, int, int] | None = None
+        # 进度更新节流：两次刷新至少间隔 _PROGRESS_MIN_INTERVAL 秒，期间只保留最新一次
+        self._last_progress_ts = 0.0
+        self._pending_progress: tuple[int, str] | None = None
+        # 拖动窗口时鼠标相对窗口左上角的偏移；None 表示当前未在拖动
+        self.drag_position: QPoint | None = None
+        # 光标缓存：只在边缘状态变化时才 setCursor；QCursor 对象只构造一次
+        self._last_cursor_edges_bits = 0
+        self._cursors = {
+            shape: QCursor(shape)
+            for shape in (
+                Qt.CursorShape.ArrowCursor,
+                Qt.CursorShape.SizeFDiagCursor,
+                Qt.CursorShape.SizeBDiagCursor,
+                Qt.CursorShape.SizeHorCursor,
+                Qt.CursorShape.SizeVerCursor,
+            )
+        }
 
         self.setMouseTracking(True)
         self.installEventFilter(self)
+        self._install_on_tree(self)
+
+    def _install_on_tree(self, root: QWidget) -> None:
+        """给 root 下所有子控件开启鼠标跟踪并安装本窗口的事件过滤器（用于边缘缩放）。"""
         try:
-            for w in self.findChildren(QWidget):
-                try:
-                    w.setMouseTracking(True)
-                except Exception:
-                    pass
-                try:
-                    w.installEventFilter(self)
-                except Exception:
-                    pass
+            children = root.findChildren(QWidget, options=Qt.FindChildOption.FindChildrenRecursively)
         except Exception:
-            pass
+            return
+        for w in children:
+            w.setMouseTracking(True)
+            w.installEventFilter(self)
         
     def init_ui(self):
         """初始化用户界面"""
         # 创建主框架
         self.main_frame = QFrame(self)
         self.main_frame.setObjectName("mainFrame")
-        self.main_frame.setStyleSheet("""
-            QFrame#mainFrame {
-                background-color: rgba(30, 30, 30, 230);
-                border: 2px solid rgba(100, 100, 100, 200);
-                border-radius: 10px;
-            }
-        """)
+        self.main_frame.setStyleSheet(_QSS_MAIN_FRAME)
         
         # 主布局
         main_layout = QVBoxLayout(self.main_frame)
@@ -95,10 +316,7 @@ class TranslationOverlay(QWidget):
         title_layout = QHBoxLayout()
         
         self.title_label = QLabel("翻译结果")
-        title_font = QFont()
-        title_font.setPointSize(12)
-        title_font.setBold(True)
-        self.title_label.setFont(title_font)
+        self.title_label.setFont(_TITLE_FONT)
         self.title_label.setStyleSheet("color: #4CAF50;")
         title_layout.addWidget(self.title_label)
         
@@ -110,18 +328,7 @@ class TranslationOverlay(QWidget):
         # 关闭按钮
         self.close_button = QPushButton("×")
         self.close_button.setFixedSize(20, 20)
-        self.close_button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(255, 100, 100, 150);
-                color: white;
-                border: none;
-                border-radius: 10px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 50, 50, 200);
-            }
-        """)
+        self.close_button.setStyleSheet(_QSS_CLOSE_BUTTON)
         self.close_button.clicked.connect(self.hide_overlay)
         title_layout.addWidget(self.close_button)
         
@@ -130,14 +337,7 @@ class TranslationOverlay(QWidget):
         # 2. 原文区域
         original_group = QFrame()
         self.original_group = original_group
-        original_group.setStyleSheet("""
-            QFrame {
-                background-color: rgba(40, 40, 40, 180);
-                border: 1px solid rgba(80, 80, 80, 150);
-                border-radius: 5px;
-                padding: 5px;
-            }
-        """)
+        original_group.setStyleSheet(_QSS_ORIGINAL_GROUP)
         
         original_layout = QVBoxLayout(original_group)
         self.original_title = None
@@ -150,18 +350,7 @@ class TranslationOverlay(QWidget):
         # 原文文本框（可编辑）
         self.original_text = QTextEdit()
         self.original_text.setReadOnly(False)
-        self.original_text.setStyleSheet("""
-            QTextEdit {
-                background: rgba(30, 30, 30, 100);
-                color: #CCCCCC;
-                font-size: 11px;
-                border: 1px solid rgba(100, 100, 100, 50);
-                border-radius: 3px;
-            }
-            QTextEdit:focus {
-                border: 1px solid rgba(76, 175, 80, 150);
-            }
-        """)
+        self.original_text.setStyleSheet(_QSS_ORIGINAL_TEXT)
         self.original_text.setMinimumHeight(80)
         original_layout.addWidget(self.original_text)
         
@@ -170,14 +359,7 @@ class TranslationOverlay(QWidget):
         # 3. 翻译结果区域
         translation_group = QFrame()
         self.translation_group = translation_group
-        translation_group.setStyleSheet("""
-            QFrame {
-                background-color: rgba(50, 50, 50, 180);
-                border: 1px solid rgba(100, 100, 100, 150);
-                border-radius: 5px;
-                padding: 5px;
-            }
-        """)
+        translation_group.setStyleSheet(_QSS_TRANSLATION_GROUP)
         
         translation_layout = QVBoxLayout(translation_group)
         self.translation_title = None
@@ -187,50 +369,13 @@ class TranslationOverlay(QWidget):
         translation_layout.addWidget(translation_title)
         self.translation_title = translation_title
         
-        # 进度条容器（翻译过程中显示）
-        self.progress_container = QFrame()
-        progress_layout = QVBoxLayout(self.progress_container)
-        progress_layout.setContentsMargins(0, 0, 0, 0)
-        progress_layout.setSpacing(2)
-        
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 100)
-        self.progress_bar.setValue(0)
-        self.progress_bar.setTextVisible(True)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                background: rgba(60, 60, 60, 150);
-                border: 1px solid rgba(100, 100, 100, 100);
-                border-radius: 3px;
-                text-align: center;
-                color: #AAAAAA;
-                font-size: 10px;
-                height: 16px;
-            }
-            QProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #4CAF50, stop:1 #8BC34A);
-                border-radius: 2px;
-            }
-        """)
-        self.progress_bar.setFixedHeight(16)
-        progress_layout.addWidget(self.progress_bar)
-        
-        self.progress_label = QLabel("")
-        self.progress_label.setStyleSheet("color: #666666; font-size: 9px;")
-        progress_layout.addWidget(self.progress_label)
-        
-        # 翻译结果文本框（翻译完成后显示）
-        self.translation_text = QTextEdit()
-        self.translation_text.setReadOnly(True)
-        self._apply_translation_text_style()
-        self.translation_text.setMinimumHeight(80)
-        
-        # 初始状态：显示进度条，隐藏翻译结果
-        self.translation_text.setVisible(False)
-        
-        translation_layout.addWidget(self.progress_container)
-        translation_layout.addWidget(self.translation_text)
+        # 进度条与翻译结果文本框延迟到第一次需要时再创建
+        # （见 _ensure_progress_ui / _ensure_translation_ui）
+        self._translation_layout = translation_layout
+        self.progress_container = None
+        self.progress_bar = None
+        self.progress_label = None
+        self.translation_text = None
         
         main_layout.addWidget(translation_group)
         
@@ -239,62 +384,20 @@ class TranslationOverlay(QWidget):
         
         # 复制按钮
         self.copy_button = QPushButton("复制翻译")
-        self.copy_button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(76, 175, 80, 150);
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 10px;
-            }
-            QPushButton:hover {
-                background-color: rgba(76, 175, 80, 200);
-            }
-        """)
+        self.copy_button.setStyleSheet(_QSS_COPY_BUTTON)
         self.copy_button.clicked.connect(self.copy_translation)
         button_layout.addWidget(self.copy_button)
         
         # 固定按钮
         self.pin_button = QPushButton("固定")
         self.pin_button.setCheckable(True)
-        self.pin_button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(100, 100, 100, 150);
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 10px;
-            }
-            QPushButton:checked {
-                background-color: rgba(33, 150, 243, 200);
-            }
-            QPushButton:hover {
-                background-color: rgba(150, 150, 150, 200);
-            }
-        """)
+        self.pin_button.setStyleSheet(_QSS_PIN_BUTTON)
         self.pin_button.toggled.connect(self.toggle_pin)
         button_layout.addWidget(self.pin_button)
         
         # 重新翻译按钮
         self.retranslate_button = QPushButton("重新翻译")
-        self.retranslate_button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(33, 150, 243, 150);
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 5px 10px;
-                font-size: 10px;
-            }
-            QPushButton:hover {
-                background-color: rgba(33, 150, 243, 200);
-            }
-            QPushButton:pressed {
-                background-color: rgba(25, 118, 210, 200);
-            }
-        """)
+        self.retranslate_button.setStyleSheet(_QSS_RETRANSLATE_BUTTON)
         self.retranslate_button.clicked.connect(self.request_retranslate)
         button_layout.addWidget(self.retranslate_button)
         
@@ -306,6 +409,48 @@ class TranslationOverlay(QWidget):
         self.layout().setContentsMargins(0, 0, 0, 0)
         self._apply_accent_mode("default")
 
+    def _ensure_progress_ui(self) -> None:
+        """按需创建进度条容器（翻译过程中显示），放在翻译区标题之后。"""
+        if self.progress_container is not None:
+            return
+        container = QFrame()
+        progress_layout = QVBoxLayout(container)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        progress_layout.setSpacing(2)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setStyleSheet(_QSS_PROGRESS_BAR)
+        self.progress_bar.setFixedHeight(16)
+        progress_layout.addWidget(self.progress_bar)
+        
+        self.progress_label = QLabel("")
+        self.progress_label.setStyleSheet("color: #666666; font-size: 9px;")
+        progress_layout.addWidget(self.progress_label)
+        
+        self.progress_container = container
+        self._translation_layout.insertWidget(1, container)
+        container.setMouseTracking(True)
+        container.installEventFilter(self)
+        self._install_on_tree(container)
+
+    def _ensure_translation_ui(self) -> None:
+        """按需创建翻译结果文本框（翻译完成后显示），放在翻译区末尾，初始隐藏。"""
+        if self.translation_text is not None:
+            return
+        edit = QTextEdit()
+        edit.setReadOnly(True)
+        edit.setMinimumHeight(80)
+        edit.setVisible(False)
+        self.translation_text = edit
+        self._apply_translation_text_style()
+        self._translation_layout.addWidget(edit)
+        edit.setMouseTracking(True)
+        edit.installEventFilter(self)
+        self._install_on_tree(edit)
+
     def _apply_accent_mode(self, mode: str) -> None:
         """Apply the default or hook accent palette."""
         mode = "hook" if str(mode or "").strip().lower() == "hook" else "default"
@@ -313,36 +458,27 @@ class TranslationOverlay(QWidget):
         if mode == "hook":
             self.title_label.setStyleSheet("color: #4DA3FF;")
             self.language_label.setStyleSheet("color: #9FC8FF; font-size: 10px;")
-            self.translation_group.setStyleSheet("""
-                QFrame {
-                    background-color: rgba(25, 42, 68, 210);
-                    border: 1px solid rgba(77, 163, 255, 190);
-                    border-radius: 5px;
-                    padding: 5px;
-                }
-            """)
+            self.translation_group.setStyleSheet(_QSS_TRANSLATION_GROUP_HOOK)
             if self.translation_title is not None:
                 self.translation_title.setStyleSheet("color: #9FC8FF; font-size: 10px;")
         else:
             self.title_label.setStyleSheet("color: #4CAF50;")
             self.language_label.setStyleSheet("color: #888888; font-size: 10px;")
-            self.translation_group.setStyleSheet("""
-                QFrame {
-                    background-color: rgba(50, 50, 50, 180);
-                    border: 1px solid rgba(100, 100, 100, 150);
-                    border-radius: 5px;
-                    padding: 5px;
-                }
-            """)
+            self.translation_group.setStyleSheet(_QSS_TRANSLATION_GROUP)
             if self.translation_title is not None:
                 self.translation_title.setStyleSheet("color: #888888; font-size: 10px;")
-        if hasattr(self, "translation_text") and self.translation_text is not None:
+        if getattr(self, "translation_text", None) is not None:
             self._apply_translation_text_style()
 
     def set_hook_context(self, source_lang: str, target_lang: str) -> None:
         """Apply hook styling and show the active language pair."""
         self._apply_accent_mode("hook")
         self.language_label.setText(f"{source_lang} → {target_lang}")
+        self._ui_state = None
+
+    def invalidate_ui_state(self) -> None:
+        """外部直接修改了进度/按钮/标签等控件后调用，确保下次 show_* 完整重设状态。"""
+        self._ui_state = None
 
     def _apply_translation_text_style(self):
         """根据当前设置应用翻译文本样式（用于动态更新颜色等）。"""
@@ -352,11 +488,16 @@ class TranslationOverlay(QWidget):
                 c = QColor("#FFFFFF")
         except Exception:
             c = QColor("#FFFFFF")
-        if getattr(self, "_accent_mode", "default") == "hook":
+        name = c.name().upper()
+        mode = getattr(self, "_accent_mode", "default")
+        if (mode, name) == self._last_applied_text_style:
+            return
+        self._last_applied_text_style = (mode, name)
+        if mode == "hook":
             self.translation_text.setStyleSheet(f"""
                 QTextEdit {{
                     background: rgba(13, 26, 44, 110);
-                    color: {c.name().upper()};
+                    color: {name};
                     font-size: 12px;
                     font-weight: bold;
                     border: 1px solid rgba(77, 163, 255, 150);
@@ -367,7 +508,7 @@ class TranslationOverlay(QWidget):
             self.translation_text.setStyleSheet(f"""
                 QTextEdit {{
                     background: transparent;
-                    color: {c.name().upper()};
+                    color: {name};
                     font-size: 12px;
                     font-weight: bold;
                     border: none;
@@ -385,21 +526,43 @@ class TranslationOverlay(QWidget):
                 return
         except Exception:
             return
-        self.text_color = c.name().upper()
-        # 若 UI 尚未创建，则等 init_ui 后再应用
-        if hasattr(self, "translation_text") and self.translation_text is not None:
+        name = c.name().upper()
+        if name == self.text_color:
+            return
+        self.text_color = name
+        # 若翻译文本框尚未创建，则在 _ensure_translation_ui 创建时再应用
+        if getattr(self, "translation_text", None) is not None:
             self._apply_translation_text_style()
         
+    def _available_geometry(self, screen) -> QRect:
+        """返回屏幕可用区域；与上次是同一块屏幕时复用缓存的 QRect。"""
+        if screen is None:
+            screen = QApplication.primaryScreen()
+        cache = self._screen_geom_cache
+        if cache is not None and cache[0] is screen:
+            return cache[1]
+        geom = screen.availableGeometry()
+        self._screen_geom_cache = (screen, geom)
+        if id(screen) not in self._screen_geom_watched:
+            try:
+                screen.availableGeometryChanged.connect(self._invalidate_screen_geom_cache)
+                self._screen_geom_watched.add(id(screen))
+            except Exception:
+                pass
+        return geom
+
+    def _invalidate_screen_geom_cache(self, *_args) -> None:
+        self._screen_geom_cache = None
+
     def move_to_corner(self):
         """将窗口移动到屏幕右下角"""
         # 以当前鼠标所在屏幕为准（多屏更合理）；兜底 primaryScreen
         try:
-            from PyQt6.QtGui import QGuiApplication
             screen = QGuiApplication.screenAt(QCursor.pos()) or QApplication.primaryScreen()
         except Exception:
             screen = QApplication.primaryScreen()
 
-        screen_geometry = screen.availableGeometry() if screen is not None else QApplication.primaryScreen().availableGeometry()
+        screen_geometry = self._available_geometry(screen)
         window_width = self.width()
         window_height = self.height()
         
@@ -411,20 +574,26 @@ class TranslationOverlay(QWidget):
     def show_ocr_result(self, original_text, rect):
         """显示OCR识别结果（立即显示，翻译在后台进行）"""
         self._mode = "ocr"
+        self._pending_progress = None
         self._apply_accent_mode("default")
         # 设置原文内容
-        self.original_text.setPlainText(original_text)
+        _set_plain_text_if_changed(self.original_text, original_text)
         
-        # 显示进度条，隐藏翻译结果
-        self.progress_container.setVisible(True)
-        self.translation_text.setVisible(False)
-        
-        # 设置语言标签为OCR状态
-        self.language_label.setText("OCR完成，翻译中...")
-        
-        # 重置重新翻译按钮状态
-        self.retranslate_button.setText("重新翻译")
-        self.retranslate_button.setEnabled(False)  # 翻译完成前禁用
+        self._ensure_progress_ui()
+        self._ensure_translation_ui()
+        # 连续截图时若已处于“OCR 完成、等待翻译”状态，跳过下面这组重复的控件设置
+        if self._ui_state != "ocr_loading":
+            # 显示进度条，隐藏翻译结果
+            self.progress_container.setVisible(True)
+            self.translation_text.setVisible(False)
+            
+            # 设置语言标签为OCR状态
+            self.language_label.setText("OCR完成，翻译中...")
+            
+            # 重置重新翻译按钮状态
+            self.retranslate_button.setText("重新翻译")
+            self.retranslate_button.setEnabled(False)  # 翻译完成前禁用
+            self._ui_state = "ocr_loading"
 
         # 调整窗口大小以适应内容
         self.adjust_size()
@@ -439,12 +608,12 @@ class TranslationOverlay(QWidget):
         self.fade_in()
         
         # 如果启用自动隐藏，启动定时器（但翻译完成后会重置）
-        if self.auto_hide and not self.pin_button.isChecked():
-            self.hide_timer.start(self.timeout * 1000)
+        self._schedule_hide()
 
     def show_text_mode(self, title_text: str | None = None, hint_text: str | None = None):
         """进入输入模式：用户手动输入/粘贴文本进行翻译（不走 OCR，也不做预处理）。"""
         self._mode = "input"
+        self._pending_progress = None
         is_hook_mode = "hook" in str(title_text or "").lower()
         self._apply_accent_mode("hook" if is_hook_mode else "default")
 
@@ -463,14 +632,17 @@ class TranslationOverlay(QWidget):
         # 清空内容，给出提示
         self.original_text.setPlainText("")
         
-        # 显示翻译结果区域，隐藏进度条
-        self.progress_container.setVisible(False)
+        # 显示翻译结果区域，隐藏进度条（文本模式不需要预先创建进度条）
+        self._ensure_translation_ui()
+        if self.progress_container is not None:
+            self.progress_container.setVisible(False)
         self.translation_text.setVisible(True)
         self.translation_text.setPlainText("请输入原文，然后点击“翻译”。")
 
         # 按钮状态
         self.retranslate_button.setText("翻译")
         self.retranslate_button.setEnabled(True)
+        self._ui_state = "text_mode"
 
         # 位置/显示
         self.adjust_size()
@@ -485,13 +657,16 @@ class TranslationOverlay(QWidget):
     def show_translation(self, original_text, translated_text, source_lang, target_lang):
         """显示完整的翻译结果（同步模式）"""
         # 设置文本内容
+        self._pending_progress = None
         self._apply_accent_mode("default")
-        self.original_text.setPlainText(original_text)
+        _set_plain_text_if_changed(self.original_text, original_text)
         
         # 显示翻译结果，隐藏进度条
-        self.progress_container.setVisible(False)
+        self._ensure_translation_ui()
+        if self.progress_container is not None:
+            self.progress_container.setVisible(False)
         self.translation_text.setVisible(True)
-        self.translation_text.setPlainText(translated_text)
+        _set_plain_text_if_changed(self.translation_text, translated_text)
         
         # 重置重新翻译按钮状态
         self.retranslate_button.setText("重新翻译")
@@ -499,6 +674,7 @@ class TranslationOverlay(QWidget):
 
         # 设置语言标签
         self.language_label.setText(f"{source_lang} → {target_lang}")
+        self._ui_state = "ocr_done"
         
         # 调整窗口大小以适应内容
         self.adjust_size()
@@ -513,17 +689,20 @@ class TranslationOverlay(QWidget):
         self.fade_in()
         
         # 如果启用自动隐藏，启动定时器
-        if self.auto_hide and not self.pin_button.isChecked():
-            self.hide_timer.start(self.timeout * 1000)
+        self._schedule_hide()
             
     def update_translation_result(self, translated_text):
         """异步更新翻译结果"""
+        # 丢弃尚未刷新的进度，避免结果显示后又被切回进度条
+        self._pending_progress = None
         # 隐藏进度条，显示翻译结果
-        self.progress_container.setVisible(False)
+        self._ensure_translation_ui()
+        if self.progress_container is not None:
+            self.progress_container.setVisible(False)
         self.translation_text.setVisible(True)
         
         # 更新翻译文本
-        self.translation_text.setPlainText(translated_text)
+        _set_plain_text_if_changed(self.translation_text, translated_text)
         
         # 启用重新翻译按钮
         self.retranslate_button.setEnabled(True)
@@ -531,17 +710,40 @@ class TranslationOverlay(QWidget):
         # 更新语言标签为完成状态
         if self.language_label.text().startswith("OCR完成"):
             self.language_label.setText("翻译完成")
+        self._ui_state = "ocr_done"
         
         # 重置自动隐藏定时器
-        if self.auto_hide and not self.pin_button.isChecked():
-            self.hide_timer.stop()
-            self.hide_timer.start(self.timeout * 1000)
+        self._schedule_hide()
             
     def update_translation_progress(self, progress: int, status_text: str):
-        """更新翻译进度"""
-        # 确保进度条可见，翻译文本隐藏
-        self.progress_container.setVisible(True)
-        self.translation_text.setVisible(False)
+        """更新翻译进度（节流：首个更新立即生效，密集更新合并为 100ms 后的最后一次；100% 立即生效）"""
+        now = time.monotonic()
+        if progress < 100 and (now - self._last_progress_ts) < self._PROGRESS_MIN_INTERVAL:
+            schedule = self._pending_progress is None
+            self._pending_progress = (progress, status_text)
+            if schedule:
+                QTimer.singleShot(int(self._PROGRESS_MIN_INTERVAL * 1000), self._flush_progress)
+            return
+        self._pending_progress = None
+        self._last_progress_ts = now
+        self._apply_translation_progress(progress, status_text)
+
+    def _flush_progress(self) -> None:
+        pending = self._pending_progress
+        if pending is None:
+            return
+        self._pending_progress = None
+        self._last_progress_ts = time.monotonic()
+        self._apply_translation_progress(*pending)
+
+    def _apply_translation_progress(self, progress: int, status_text: str) -> None:
+        self._ensure_progress_ui()
+        self._ensure_translation_ui()
+        # 确保进度条可见，翻译文本隐藏（这几种状态下已经是该布局）
+        if self._ui_state not in ("ocr_loading", "retranslating", "progress"):
+            self.progress_container.setVisible(True)
+            self.translation_text.setVisible(False)
+            self._ui_state = "progress"
         
         # 更新进度条和标签
         self.progress_bar.setValue(progress)
@@ -551,12 +753,11 @@ class TranslationOverlay(QWidget):
         """将窗口移动到截图区域附近"""
         # 以截图区域中心所在的屏幕为准（多屏 + 非(0,0)原点）
         try:
-            from PyQt6.QtGui import QGuiApplication
             screen = QGuiApplication.screenAt(rect.center()) or QApplication.primaryScreen()
         except Exception:
             screen = QApplication.primaryScreen()
 
-        screen_geometry = screen.availableGeometry() if screen is not None else QApplication.primaryScreen().availableGeometry()
+        screen_geometry = self._available_geometry(screen)
         window_width = self.width()
         window_height = self.height()
         
@@ -585,26 +786,43 @@ class TranslationOverlay(QWidget):
         
     def fade_in(self):
         """淡入动画"""
+        self._fade_anim.stop()
         self.setWindowOpacity(0)
         self.show()
         
-        self.animation = QPropertyAnimation(self, b"windowOpacity")
-        self.animation.setDuration(300)  # 300毫秒
-        self.animation.setStartValue(0)
-        self.animation.setEndValue(self.opacity)
-        self.animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        self.animation.start()
+        self._fade_hide_on_finish = False
+        self._fade_anim.setStartValue(0)
+        self._fade_anim.setEndValue(self.opacity)
+        self._fade_anim.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self._fade_anim.start()
         
     def fade_out(self):
         """淡出动画"""
-        self.animation = QPropertyAnimation(self, b"windowOpacity")
-        self.animation.setDuration(300)  # 300毫秒
-        self.animation.setStartValue(self.opacity)
-        self.animation.setEndValue(0)
-        self.animation.setEasingCurve(QEasingCurve.Type.InCubic)
-        self.animation.finished.connect(self.hide)
-        self.animation.start()
+        self._fade_anim.stop()
+        self._fade_hide_on_finish = True
+        self._fade_anim.setStartValue(self.opacity)
+        self._fade_anim.setEndValue(0)
+        self._fade_anim.setEasingCurve(QEasingCurve.Type.InCubic)
+        self._fade_anim.start()
+
+    def _on_fade_finished(self):
+        if self._fade_hide_on_finish:
+            self._fade_hide_on_finish = False
+            self.hide()
         
+    def _schedule_hide(self) -> None:
+        """（重新）启动自动隐藏定时器；未启用自动隐藏或已固定时不启动。
+
+        定时器刚启动不久（剩余时间与完整超时相差不到 250ms）时不再重启，减少定时器抖动。
+        """
+        if not self.auto_hide or self.pin_button.isChecked():
+            return
+        interval = self.timeout * 1000
+        remaining = self.hide_timer.remainingTime()
+        if remaining > 0 and abs(remaining - interval) < 250:
+            return
+        self.hide_timer.start(interval)
+
     def hide_overlay(self):
         """隐藏悬浮窗"""
         if self.hide_timer.isActive():
@@ -621,14 +839,13 @@ class TranslationOverlay(QWidget):
             self.pin_button.setText("已固定")
         else:
             # 取消固定时重新启动定时器（如果启用自动隐藏）
-            if self.auto_hide:
-                self.hide_timer.start(self.timeout * 1000)
+            self._schedule_hide()
             self.pin_button.setText("固定")
             
     def copy_translation(self):
         """复制翻译文本到剪贴板"""
         clipboard = QApplication.clipboard()
-        clipboard.setText(self.translation_text.toPlainText())
+        clipboard.setText(self.translation_text.toPlainText() if self.translation_text is not None else "")
         
         # 显示复制成功的反馈
         self.copy_button.setText("已复制!")
@@ -643,8 +860,11 @@ class TranslationOverlay(QWidget):
             self.retranslate_button.setText("正在翻译...")
             self.retranslate_button.setEnabled(False)
             # 显示进度条，隐藏翻译结果
+            self._ensure_progress_ui()
+            self._ensure_translation_ui()
             self.progress_container.setVisible(True)
             self.translation_text.setVisible(False)
+            self._ui_state = "retranslating"
             disable_preprocess = (self._mode == "input")
             # 为兼容旧行为：OCR/重译场景仍默认 trim；文本模式严格原样发送
             text_to_send = raw_text if disable_preprocess else raw_text.strip()
@@ -678,7 +898,7 @@ class TranslationOverlay(QWidget):
             event.accept()
             return
 
-        if event.buttons() == Qt.MouseButton.LeftButton and hasattr(self, 'drag_position'):
+        if self.drag_position is not None and event.buttons() == Qt.MouseButton.LeftButton:
             self.move(event.globalPosition().toPoint() - self.drag_position)
             event.accept()
             return
@@ -696,11 +916,7 @@ class TranslationOverlay(QWidget):
                 self._end_resize()
                 event.accept()
                 return
-            if hasattr(self, 'drag_position'):
-                try:
-                    delattr(self, 'drag_position')
-                except Exception:
-                    pass
+            self.drag_position = None
             event.accept()
             return
         super().mouseReleaseEvent(event)
@@ -710,22 +926,27 @@ class TranslationOverlay(QWidget):
             et = event.type()
         except Exception:
             return False
+        # 绝大多数事件（绘制/定时器/焦点等）在这里直接放行
+        if et != self._ET_MOVE and et != self._ET_PRESS and et != self._ET_RELEASE:
+            return False
 
-        if et == QEvent.Type.MouseMove:
+        if et == self._ET_MOVE:
+            # 走到这里的必然是 QMouseEvent，buttons() 一定存在
             try:
                 gp = event.globalPosition().toPoint()
                 lp = self.mapFromGlobal(gp)
+                buttons = event.buttons()
             except Exception:
                 return False
-            if self._resizing and getattr(event, "buttons", lambda: Qt.MouseButton.NoButton)() == Qt.MouseButton.LeftButton:
+            if self._resizing and buttons == Qt.MouseButton.LeftButton:
                 self._perform_resize(gp)
                 return True
-            if getattr(event, "buttons", lambda: Qt.MouseButton.NoButton)() == Qt.MouseButton.NoButton:
+            if buttons == Qt.MouseButton.NoButton:
                 self._update_cursor_for_local_pos(lp)
                 return False
             return False
 
-        if et == QEvent.Type.MouseButtonPress:
+        if et == self._ET_PRESS:
             try:
                 if event.button() != Qt.MouseButton.LeftButton:
                     return False
@@ -737,7 +958,7 @@ class TranslationOverlay(QWidget):
                 return True
             return False
 
-        if et == QEvent.Type.MouseButtonRelease:
+        if et == self._ET_RELEASE:
             try:
                 if event.button() != Qt.MouseButton.LeftButton:
                     return False
@@ -750,48 +971,37 @@ class TranslationOverlay(QWidget):
 
         return False
 
-    def _hit_test_resize_edges(self, local_pos: QPoint) -> tuple[bool, bool, bool, bool]:
-        x = int(local_pos.x())
-        y = int(local_pos.y())
-        w = int(self.width())
-        h = int(self.height())
-        m = int(self._resize_margin)
-        left = x <= m
-        right = x >= (w - m)
-        top = y <= m
-        bottom = y >= (h - m)
-        return left, right, top, bottom
-
-    def _cursor_for_edges(self, edges: tuple[bool, bool, bool, bool]):
-        left, right, top, bottom = edges
-        if (left and top) or (right and bottom):
-            return Qt.CursorShape.SizeFDiagCursor
-        if (right and top) or (left and bottom):
-            return Qt.CursorShape.SizeBDiagCursor
-        if left or right:
-            return Qt.CursorShape.SizeHorCursor
-        if top or bottom:
-            return Qt.CursorShape.SizeVerCursor
-        return Qt.CursorShape.ArrowCursor
+    def _hit_test_resize_edges(self, local_pos: QPoint) -> int:
+        return _hit_edges_bits(
+            local_pos.x(), local_pos.y(), self.width(), self.height(), self._resize_margin
+        )
+
+    def _cursor_for_edges(self, bits: int):
+        return _EDGE_CURSOR_SHAPES[bits]
 
     def _update_cursor_for_local_pos(self, local_pos: QPoint) -> None:
         try:
-            edges = self._hit_test_resize_edges(local_pos)
-            cur = self._cursor_for_edges(edges)
-            self.setCursor(QCursor(cur))
+            bits = self._hit_test_resize_edges(local_pos)
+            if bits == self._last_cursor_edges_bits:
+                return
+            self._last_cursor_edges_bits = bits
+            self.setCursor(self._cursors[_EDGE_CURSOR_SHAPES[bits]])
         except Exception:
             pass
 
     def _try_begin_resize_from_local_pos(self, local_pos: QPoint, global_pos: QPoint) -> bool:
-        edges = self._hit_test_resize_edges(local_pos)
-        if not any(edges):
+        bits = self._hit_test_resize_edges(local_pos)
+        if not bits:
             return False
         self._resizing = True
-        self._resize_edges = edges
+        self._resize_edges = _decode_edges_bits(bits)
         self._resize_start_geom = self.geometry()
         self._resize_start_global = global_pos
+        self._cached_min_w = int(self.minimumWidth())
+        self._cached_min_h = int(self.minimumHeight())
+        self._last_cursor_edges_bits = bits
         try:
-            self.setCursor(QCursor(self._cursor_for_edges(edges)))
+            self.setCursor(self._cursors[_EDGE_CURSOR_SHAPES[bits]])
         except Exception:
             pass
         return True
@@ -809,8 +1019,8 @@ class TranslationOverlay(QWidget):
         new_top = start.top() + (dy if top else 0)
         new_bottom = start.bottom() + (dy if bottom else 0)
 
-        min_w = int(self.minimumWidth())
-        min_h = int(self.minimumHeight())
+        min_w = self._cached_min_w
+        min_h = self._cached_min_h
 
         if (new_right - new_left + 1) < min_w:
             if left:
@@ -824,16 +1034,28 @@ class TranslationOverlay(QWidget):
             else:
                 new_bottom = new_top + min_h - 1
 
+        schedule = self._pending_geom is None
+        self._pending_geom = (new_left, new_top, new_right - new_left + 1, new_bottom - new_top + 1)
+        if schedule:
+            QTimer.singleShot(0, self._flush_pending_geom)
+
+    def _flush_pending_geom(self) -> None:
+        geom = self._pending_geom
+        if geom is None:
+            return
+        self._pending_geom = None
         try:
-            self.setGeometry(QRect(QPoint(new_left, new_top), QPoint(new_right, new_bottom)))
+            self.setGeometry(*geom)
         except Exception:
             pass
 
     def _end_resize(self) -> None:
+        self._flush_pending_geom()
         self._resizing = False
         self._resize_edges = (False, False, False, False)
+        self._last_cursor_edges_bits = 0
         try:
-            self.setCursor(QCursor(Qt.CursorShape.ArrowCursor))
+            self.setCursor(self._cursors[Qt.CursorShape.ArrowCursor])
         except Exception:
             pass
             
@@ -845,19 +1067,22 @@ class TranslationOverlay(QWidget):
                 
     def leaveEvent(self, event):
         """鼠标离开事件，恢复自动隐藏"""
-        if self.auto_hide and not self.pin_button.isChecked():
-            if not self.hide_timer.isActive():
-                self.hide_timer.start(self.timeout * 1000)
+        if not self.hide_timer.isActive():
+            self._schedule_hide()
                 
+    def resizeEvent(self, event):
+        """尺寸变化时重新计算阴影区域（布局已先于本事件更新 main_frame 几何）"""
+        super().resizeEvent(event)
+        main_frame = getattr(self, "main_frame", None)
+        if main_frame is not None:
+            self._shadow_rect = main_frame.geometry().adjusted(-5, -5, 5, 5)
+
     def paintEvent(self, event):
         """绘制事件，添加阴影效果"""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # 绘制阴影
+        # 绘制阴影（复用缓存的画刷与区域，不在每次绘制时分配）
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(QColor(0, 0, 0, 50)))
-        painter.drawRoundedRect(
-            self.main_frame.geometry().adjusted(-5, -5, 5, 5),
-            15, 15
-        )
+        painter.setBrush(self._shadow_brush)
+        painter.drawRoundedRect(self._shadow_rect, 15, 15)
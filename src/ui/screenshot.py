@@ -7,7 +7,7 @@ from typing import Optional, Tuple
 from dataclasses import dataclass
 
 from PyQt6.QtCore import Qt, QRect, QPoint, pyqtSignal, QObject, QTimer
-from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QGuiApplication, QCursor, QPixmap
+from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QGuiApplication, QCursor, QPixmap, QFont, QFontMetrics
 from PyQt6.QtWidgets import QWidget, QApplication
 
 
@@ -20,12 +20,126 @@ class ScreenshotResult:
     error: Optional[str] = None
 
 
+# 虚拟桌面（所有屏幕并集）几何缓存；屏幕增删或几何变化时失效
+_virtual_geo_cache: Optional[QRect] = None
+_virtual_geo_hooked = False
+
+
+def _invalidate_virtual_geometry(*_args) -> None:
+    global _virtual_geo_cache
+    _virtual_geo_cache = None
+
+
+def _on_screen_added(screen) -> None:
+    try:
+        screen.geometryChanged.connect(_invalidate_virtual_geometry)
+    except Exception:
+        pass
+    _invalidate_virtual_geometry()
+
+
+def _hook_virtual_geometry_signals() -> None:
+    """只连接一次屏幕变化信号（需要 QGuiApplication 已创建）"""
+    global _virtual_geo_hooked
+    if _virtual_geo_hooked:
+        return
+    app = QGuiApplication.instance()
+    if app is None:
+        return
+    try:
+        app.screenAdded.connect(_on_screen_added)
+        app.screenRemoved.connect(_invalidate_virtual_geometry)
+        for s in QGuiApplication.screens() or []:
+            s.geometryChanged.connect(_invalidate_virtual_geometry)
+    except Exception:
+        return
+    _virtual_geo_hooked = True
+
+
+def _virtual_geometry() -> QRect:
+    """返回覆盖“虚拟桌面”（多屏幕）的矩形（缓存未命中时才枚举屏幕）"""
+    global _virtual_geo_cache
+    _hook_virtual_geometry_signals()
+    if _virtual_geo_cache is None:
+        virtual_geo = QRect()
+        for s in QGuiApplication.screens() or []:
+            try:
+                virtual_geo = virtual_geo.united(s.geometry())
+            except Exception:
+                pass
+        if virtual_geo.isNull():
+            screen = QGuiApplication.primaryScreen()
+            if screen is not None:
+                virtual_geo = screen.geometry()
+        if virtual_geo.isNull():
+            # 兜底
+            virtual_geo = QRect(0, 0, 1920, 1080)
+        if not _virtual_geo_hooked:
+            # 无法监听屏幕变化时不缓存，避免拿到过期几何
+            return virtual_geo
+        _virtual_geo_cache = virtual_geo
+    return QRect(_virtual_geo_cache)
+
+
+def _grab_screen_rect(screen, rect: QRect) -> QPixmap:
+    """
+    在 screen 上按桌面坐标截取 rect（grabWindow(window=0)），并确保返回的 QPixmap
+    标注了该屏幕的 devicePixelRatio：后续绘制/显示按原生像素对应，不会再被重采样。
+    """
+    pixmap = screen.grabWindow(0, rect.x(), rect.y(), rect.width(), rect.height())
+    try:
+        dpr = float(screen.devicePixelRatio())
+        if dpr > 0 and abs(pixmap.devicePixelRatio() - dpr) > 1e-6:
+            pixmap.setDevicePixelRatio(dpr)
+    except Exception:
+        pass
+    return pixmap
+
+
+def _composite_over(top: QColor, bottom: QColor) -> QColor:
+    """top 叠加在 bottom 上（source-over）得到的等效单一颜色"""
+    ta = top.alphaF()
+    ba = bottom.alphaF()
+    out_a = ta + ba * (1.0 - ta)
+    if out_a <= 0.0:
+        return QColor(0, 0, 0, 0)
+
+    def ch(t: int, b: int) -> int:
+        return max(0, min(255, round((t * ta + b * ba * (1.0 - ta)) / out_a)))
+
+    return QColor(
+        ch(top.red(), bottom.red()),
+        ch(top.green(), bottom.green()),
+        ch(top.blue(), bottom.blue()),
+        max(0, min(255, round(out_a * 255))),
+    )
+
+
+def _rects_around(outer: QRect, hole: QRect):
+    """outer 去掉 hole 后剩余的（最多四个）矩形：上、下、左、右"""
+    inner = outer.intersected(hole)
+    if inner.isEmpty():
+        return [outer]
+    parts = [
+        QRect(outer.left(), outer.top(), outer.width(), inner.top() - outer.top()),
+        QRect(outer.left(), inner.bottom() + 1, outer.width(), outer.bottom() - inner.bottom()),
+        QRect(outer.left(), inner.top(), inner.left() - outer.left(), inner.height()),
+        QRect(inner.right() + 1, inner.top(), outer.right() - inner.right(), inner.height()),
+    ]
+    return [r for r in parts if not r.isEmpty()]
+
+
 class ScreenshotOverlay(QWidget):
     """截图遮罩层"""
     
     screenshot_taken = pyqtSignal(ScreenshotResult)
     
-    def __init__(self):
+    def __init__(self, show_cursor_pos: bool = True):
+        """
+        Args:
+            show_cursor_pos: 是否在鼠标旁显示坐标。关闭时同时关闭鼠标跟踪：
+                未按下鼠标时不再收到移动事件，也就不会为坐标标签重绘（选区拖动不受影响）。
+        """
         super().__init__()
         
         # 设置窗口属性
@@ -36,20 +150,7 @@ class ScreenshotOverlay(QWidget):
         )
         
         # 设置窗口覆盖“虚拟桌面”（多屏幕）
-        virtual_geo = QRect()
-        for s in QGuiApplication.screens() or []:
-            try:
-                virtual_geo = virtual_geo.united(s.geometry())
-            except Exception:
-                pass
-        if virtual_geo.isNull():
-            screen = QGuiApplication.primaryScreen()
-            if screen is not None:
-                virtual_geo = screen.geometry()
-        if virtual_geo.isNull():
-            # 兜底
-            virtual_geo = QRect(0, 0, 1920, 1080)
-        self.setGeometry(virtual_geo)
+        self.setGeometry(_virtual_geometry())
         
         # 设置半透明背景
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
@@ -68,87 +169,126 @@ class ScreenshotOverlay(QWidget):
         self.selection_color = QColor(255, 255, 255, 30)  # 半透明白色选区
         self.border_color = QColor(66, 133, 244, 255)  # 蓝色边框
         self.border_width = 2
+        # 选区内直接用“遮罩 + 选区色”的合成色填充一次，遮罩本身不再覆盖选区
+        self._selection_fill = _composite_over(self.selection_color, self.overlay_color)
+        
+        # 尺寸/坐标标签用的字体、字体度量与颜色：只构造一次，paintEvent 中直接复用
+        self._label_font = QFont(self.font())
+        self._label_font.setPointSize(10)
+        self._fm = QFontMetrics(self._label_font)
+        self._bg_color = QColor(0, 0, 0, 150)
+        self._white = QColor(255, 255, 255)
+        self._border_pen = QPen(self.border_color)
+        self._border_pen.setWidth(self.border_width)
         
         # 显示鼠标当前位置
-        self.show_cursor_pos = True
+        self.show_cursor_pos = bool(show_cursor_pos)
+        
+        # 局部重绘用：最近一次鼠标全局坐标，以及上一帧选区/坐标标签占据的区域
+        self._cursor_pos: Optional[QPoint] = None
+        self._last_selection_rect = QRect()
+        self._last_cursor_rect = QRect()
         
-        # 设置鼠标跟踪
-        self.setMouseTracking(True)
+        # 坐标标签重绘节流：鼠标悬停移动时最多约每帧（16ms）重绘一次
+        self._cursor_redraw_timer = QTimer(self)
+        self._cursor_redraw_timer.setSingleShot(True)
+        self._cursor_redraw_timer.setInterval(16)
+        self._cursor_redraw_timer.timeout.connect(self._redraw_cursor_label)
+        
+        # 设置鼠标跟踪（只有坐标标签需要悬停时的移动事件）
+        self.setMouseTracking(self.show_cursor_pos)
         
         # 设置光标
         self.setCursor(Qt.CursorShape.CrossCursor)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
     
+    def _label_box(self, text_x: int, text_y: int, text_rect: QRect) -> QRect:
+        """标签背景框（与 paintEvent 中 fillRect 的区域一致）"""
+        return QRect(
+            text_x - 2, text_y - text_rect.height() - 2,
+            text_rect.width() + 4, text_rect.height() + 4,
+        )
+
+    def _selection_label_layout(self) -> Optional[Tuple[str, int, int, QRect]]:
+        """选区尺寸标签：(文本, x, y, 背景框)；选区为空时返回 None"""
+        sel = self.selection_rect
+        if sel.isNull() or sel.width() <= 0 or sel.height() <= 0:
+            return None
+        text = f"{sel.width()} × {sel.height()}"
+        text_rect = self._fm.boundingRect(text)
+        text_x = sel.right() - text_rect.width() - 5
+        text_y = sel.bottom() - 5
+        return text, text_x, text_y, self._label_box(text_x, text_y, text_rect)
+
+    def _cursor_label_layout(self, cursor_pos: QPoint) -> Tuple[str, int, int, QRect]:
+        """鼠标坐标标签：(文本, x, y, 背景框)"""
+        text = f"{cursor_pos.x()}, {cursor_pos.y()}"
+        text_rect = self._fm.boundingRect(text)
+        text_x = cursor_pos.x() + 10
+        text_y = cursor_pos.y() - 10
+        
+        # 确保文本在窗口内
+        if text_x + text_rect.width() > self.width():
+            text_x = cursor_pos.x() - text_rect.width() - 10
+        if text_y - text_rect.height() < 0:
+            text_y = cursor_pos.y() + text_rect.height() + 10
+        return text, text_x, text_y, self._label_box(text_x, text_y, text_rect)
+
+    def _selection_dirty_rect(self) -> QRect:
+        """当前选区（含边框与尺寸标签）需要重绘的范围"""
+        if self.selection_rect.isNull():
+            return QRect()
+        r = QRect(self.selection_rect)
+        label = self._selection_label_layout()
+        if label is not None:
+            r = r.united(label[3])
+        return r
+
     def paintEvent(self, event):
-        """绘制事件"""
+        """绘制事件（只重绘 event.rect() 覆盖的脏区域）"""
         painter = QPainter(self)
+        painter.setFont(self._label_font)
+        dirty = event.rect()
+        painter.setClipRect(dirty)
         
-        # 绘制半透明遮罩
-        painter.fillRect(self.rect(), self.overlay_color)
+        # 绘制半透明遮罩（只填脏区域中选区以外的部分，选区内部由下面一次性填充）
+        for r in _rects_around(dirty, self.selection_rect):
+            painter.fillRect(r, self.overlay_color)
         
-        # 如果有选区，绘制选区
-        if not self.selection_rect.isNull():
-            # 绘制选区内部（半透明白色）
-            painter.fillRect(self.selection_rect, self.selection_color)
+        # 如果有选区（且与脏区域相交），绘制选区
+        bw = self.border_width
+        sel_box = self._selection_dirty_rect()
+        if not sel_box.isNull() and sel_box.adjusted(-bw, -bw, bw, bw).intersects(dirty):
+            # 绘制选区内部（半透明白色叠加遮罩后的合成色）
+            painter.fillRect(self.selection_rect, self._selection_fill)
             
             # 绘制选区边框
-            pen = QPen(self.border_color)
-            pen.setWidth(self.border_width)
-            painter.setPen(pen)
+            painter.setPen(self._border_pen)
             painter.drawRect(self.selection_rect)
             
-            # 绘制选区尺寸信息
-            if self.selection_rect.width() > 0 and self.selection_rect.height() > 0:
-                # 在选区右下角显示尺寸
-                text = f"{self.selection_rect.width()} × {self.selection_rect.height()}"
-                font = painter.font()
-                font.setPointSize(10)
-                painter.setFont(font)
-                
-                # 计算文本位置
-                text_rect = painter.fontMetrics().boundingRect(text)
-                text_x = self.selection_rect.right() - text_rect.width() - 5
-                text_y = self.selection_rect.bottom() - 5
+            # 绘制选区尺寸信息（在选区右下角显示尺寸）
+            label = self._selection_label_layout()
+            if label is not None:
+                text, text_x, text_y, box = label
                 
                 # 绘制文本背景
-                painter.fillRect(
-                    text_x - 2, text_y - text_rect.height() - 2,
-                    text_rect.width() + 4, text_rect.height() + 4,
-                    QColor(0, 0, 0, 150)
-                )
+                painter.fillRect(box, self._bg_color)
                 
                 # 绘制文本
-                painter.setPen(QColor(255, 255, 255))
+                painter.setPen(self._white)
                 painter.drawText(text_x, text_y, text)
         
         # 显示鼠标当前位置
         if self.show_cursor_pos and not self.is_selecting:
-            cursor_pos = QCursor.pos()
-            text = f"{cursor_pos.x()}, {cursor_pos.y()}"
-            font = painter.font()
-            font.setPointSize(10)
-            painter.setFont(font)
-            
-            text_rect = painter.fontMetrics().boundingRect(text)
-            text_x = cursor_pos.x() + 10
-            text_y = cursor_pos.y() - 10
-            
-            # 确保文本在窗口内
-            if text_x + text_rect.width() > self.width():
-                text_x = cursor_pos.x() - text_rect.width() - 10
-            if text_y - text_rect.height() < 0:
-                text_y = cursor_pos.y() + text_rect.height() + 10
-            
-            # 绘制文本背景
-            painter.fillRect(
-                text_x - 2, text_y - text_rect.height() - 2,
-                text_rect.width() + 4, text_rect.height() + 4,
-                QColor(0, 0, 0, 150)
-            )
-            
-            # 绘制文本
-            painter.setPen(QColor(255, 255, 255))
-            painter.drawText(text_x, text_y, text)
+            cursor_pos = self._cursor_pos if self._cursor_pos is not None else QCursor.pos()
+            text, text_x, text_y, box = self._cursor_label_layout(cursor_pos)
+            if box.intersects(dirty):
+                # 绘制文本背景
+                painter.fillRect(box, self._bg_color)
+                
+                # 绘制文本
+                painter.setPen(self._white)
+                painter.drawText(text_x, text_y, text)
     
     def mousePressEvent(self, event):
         """鼠标按下事件"""
@@ -157,17 +297,32 @@ class ScreenshotOverlay(QWidget):
             self.end_point = event.pos()
             self.is_selecting = True
             self.selection_rect = QRect(self.start_point, self.end_point)
+            self._last_selection_rect = self._selection_dirty_rect()
             self.update()
     
     def mouseMoveEvent(self, event):
-        """鼠标移动事件"""
+        """鼠标移动事件：只重绘旧/新选区（或旧/新坐标标签）合并后的区域"""
         if self.is_selecting:
             self.end_point = event.pos()
             self.selection_rect = QRect(self.start_point, self.end_point).normalized()
-            self.update()
-        else:
-            # 更新光标位置显示
-            self.update()
+            new_rect = self._selection_dirty_rect()
+            dirty = self._last_selection_rect.united(new_rect).adjusted(-20, -20, 20, 20)
+            self._last_selection_rect = new_rect
+            self.update(dirty)
+        elif self.show_cursor_pos:
+            # 更新光标位置显示：只记录位置，由定时器合并成每帧一次重绘
+            self._cursor_pos = event.globalPosition().toPoint()
+            if not self._cursor_redraw_timer.isActive():
+                self._cursor_redraw_timer.start()
+
+    def _redraw_cursor_label(self):
+        """重绘旧/新坐标标签合并后的区域"""
+        if self._cursor_pos is None or self.is_selecting:
+            return
+        new_rect = self._cursor_label_layout(self._cursor_pos)[3]
+        dirty = self._last_cursor_rect.united(new_rect).adjusted(-2, -2, 2, 2)
+        self._last_cursor_rect = new_rect
+        self.update(dirty)
     
     def mouseReleaseEvent(self, event):
         """鼠标释放事件"""
@@ -221,7 +376,7 @@ class ScreenshotOverlay(QWidget):
         except Exception as e:
             self.screenshot_taken.emit(ScreenshotResult(success=False, error=f"截图失败: {str(e)}"))
             self.close()
-
+
     def _do_grab_pending_rect(self):
         """真正执行 grabWindow（在遮罩层隐藏后）"""
         try:
@@ -240,13 +395,7 @@ class ScreenshotOverlay(QWidget):
                 raise RuntimeError("无法获取屏幕对象")
 
             # grabWindow(window=0) 的坐标按桌面坐标系传入（Qt 会处理多数 DPI 情况）
-            screenshot = screen.grabWindow(
-                0,
-                global_rect.x(),
-                global_rect.y(),
-                global_rect.width(),
-                global_rect.height(),
-            )
+            screenshot = _grab_screen_rect(screen, global_rect)
 
             self.screenshot_taken.emit(ScreenshotResult(success=True, image=screenshot, rect=global_rect))
             self.close()
@@ -277,25 +426,24 @@ class RegionFrameOverlay(QWidget):
         except Exception:
             pass
 
-        virtual_geo = QRect()
-        for s in QGuiApplication.screens() or []:
-            try:
-                virtual_geo = virtual_geo.united(s.geometry())
-            except Exception:
-                pass
-        if virtual_geo.isNull():
-            screen = QGuiApplication.primaryScreen()
-            if screen is not None:
-                virtual_geo = screen.geometry()
-        if virtual_geo.isNull():
-            virtual_geo = QRect(0, 0, 1920, 1080)
-        self._virtual_geo = QRect(virtual_geo)
+        self._virtual_geo = _virtual_geometry()
         self.setGeometry(self._virtual_geo)
 
         self._global_rect = QRect()
+        # 边框画笔：只构造一次，paintEvent 中直接复用
+        self._pen_outer = QPen(QColor(0, 0, 0, 110))
+        self._pen_outer.setWidth(6)
+        self._pen_outer.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+        self._pen_inner = QPen(QColor(0, 0, 0, 210))
+        self._pen_inner.setWidth(2)
+        self._pen_inner.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
 
     def set_global_rect(self, rect: Optional[QRect]) -> None:
-        self._global_rect = QRect(rect) if rect is not None else QRect()
+        new_rect = QRect(rect) if rect is not None else QRect()
+        # 同一区域被反复设置时不重复触发重绘
+        if new_rect == self._global_rect:
+            return
+        self._global_rect = new_rect
         self.update()
 
     def paintEvent(self, event):
@@ -325,17 +473,11 @@ class RegionFrameOverlay(QWidget):
         outer = QRect(local).adjusted(-2, -2, 2, 2)
         inner = QRect(local).adjusted(1, 1, -1, -1)
 
-        pen_outer = QPen(QColor(0, 0, 0, 110))
-        pen_outer.setWidth(6)
-        pen_outer.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-        painter.setPen(pen_outer)
+        painter.setPen(self._pen_outer)
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawRoundedRect(outer, 6, 6)
 
-        pen_inner = QPen(QColor(0, 0, 0, 210))
-        pen_inner.setWidth(2)
-        pen_inner.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-        painter.setPen(pen_inner)
+        painter.setPen(self._pen_inner)
         painter.drawRoundedRect(inner, 5, 5)
 
 
@@ -345,9 +487,11 @@ class ScreenshotTool(QObject):
     # 对外暴露的信号：发送 ScreenshotResult
     screenshot_taken = pyqtSignal(ScreenshotResult)
 
-    def __init__(self):
+    def __init__(self, show_cursor_pos: bool = True):
         super().__init__()
         self.overlay: Optional[ScreenshotOverlay] = None
+        # 传给截图遮罩层：是否显示鼠标坐标（见 ScreenshotOverlay）
+        self.show_cursor_pos = bool(show_cursor_pos)
 
     def start_capture(self):
         """
@@ -359,7 +503,7 @@ class ScreenshotTool(QObject):
                 return
 
             # 创建截图遮罩层
-            self.overlay = ScreenshotOverlay()
+            self.overlay = ScreenshotOverlay(show_cursor_pos=self.show_cursor_pos)
             # 将遮罩层的截图结果转发到本工具的信号
             self.overlay.screenshot_taken.connect(self._on_screenshot_taken)
             self.overlay.show()
@@ -385,6 +529,13 @@ class ScreenshotTool(QObject):
                 self.overlay = None
 
     def grab_rect(self, rect: QRect) -> ScreenshotResult:
+        """同 capture_rect（保留旧名称）"""
+        return self.capture_rect(rect)
+
+    def capture_rect(self, rect: QRect) -> ScreenshotResult:
+        """
+        只截取指定的全局矩形区域（直接 grabWindow 该区域，不先截全屏再裁剪）
+        """
         try:
             if rect is None or rect.isNull() or rect.width() <= 0 or rect.height() <= 0:
                 return ScreenshotResult(success=False, error="截图区域为空")
@@ -393,49 +544,29 @@ class ScreenshotTool(QObject):
             if screen is None:
                 return ScreenshotResult(success=False, error="无法获取屏幕对象")
 
-            screenshot = screen.grabWindow(0, rect.x(), rect.y(), rect.width(), rect.height())
+            screenshot = _grab_screen_rect(screen, rect)
             return ScreenshotResult(success=True, image=screenshot, rect=QRect(rect))
         except Exception as e:
             return ScreenshotResult(success=False, error=f"截图失败: {str(e)}")
     
     def capture(self) -> ScreenshotResult:
         """
-        启动截图
+        启动截图（已废弃，等同于 start_capture）
+        
+        截图结果只能通过 screenshot_taken 信号获取；这里不再运行嵌套的事件循环，
+        立即返回一个占位结果。需要已有 QApplication。
         
         Returns:
-            ScreenshotResult 对象
+            ScreenshotResult 对象（success=False 的占位结果）
         """
-        try:
-            # 创建应用程序实例（如果不存在）
-            app = QApplication.instance()
-            if app is None:
-                app = QApplication(sys.argv)
-            
-            # 创建截图遮罩层
-            self.overlay = ScreenshotOverlay()
-            self.overlay.show()
-            self.overlay.raise_()
-            self.overlay.activateWindow()
-            self.overlay.setFocus()
-            
-            # 运行事件循环
-            app.exec()
-            
-            # 这里应该通过信号获取结果，但为了简单起见，我们返回一个占位符
-            # 实际实现中应该使用信号槽机制
-            return ScreenshotResult(
-                success=False,
-                error="截图工具已启动，请使用信号槽获取结果"
-            )
-            
-        except Exception as e:
-            return ScreenshotResult(
-                success=False,
-                error=f"启动截图工具失败: {str(e)}"
-            )
+        self.start_capture()
+        return ScreenshotResult(
+            success=False,
+            error="截图工具已启动，请使用信号槽获取结果"
+        )
     
     def capture_full_screen(self) -> ScreenshotResult:
-        """截取全屏"""
+        """截取全屏（只需要其中一部分时请用 capture_rect，避免整屏回读）"""
         try:
             screen = QGuiApplication.primaryScreen()
             screenshot = screen.grabWindow(0)
@@ -464,16 +595,20 @@ def test_screenshot():
     app = QApplication(sys.argv)
     
     tool = ScreenshotTool()
-    result = tool.capture()
-    
-    if result.success and result.image:
-        # 保存截图
-        result.image.save("test_screenshot.png", "PNG")
-        print(f"截图成功: {result.rect}")
-    else:
-        print(f"截图失败: {result.error}")
+
+    def on_taken(result: ScreenshotResult):
+        if result.success and result.image:
+            # 保存截图
+            result.image.save("test_screenshot.png", "PNG")
+            print(f"截图成功: {result.rect}")
+        else:
+            print(f"截图失败: {result.error}")
+        app.quit()
+
+    tool.screenshot_taken.connect(on_taken)
+    tool.start_capture()
     
-    sys.exit()
+    sys.exit(app.exec())
 
 
 if __name__ == "__main__":
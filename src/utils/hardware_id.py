@@ -3,8 +3,10 @@ Windows 硬件指纹（设备ID）
 
 规则：设备ID = 主板序列号 + 硬盘序列号
 说明：
-- 尽量使用 PowerShell 的 CIM 查询（Win10/11 通用）
-- 失败时降级到 wmic（部分系统可能禁用/移除）
+- 优先进程内直接读取（主板：SMBIOS 固件表；硬盘：进程内 COM 查询 WMI），不启动子进程
+- 失败时使用 PowerShell 的 CIM 查询（Win10/11 通用）
+- 再失败时降级到 wmic（部分系统可能禁用/移除）
+- 硬盘序列号必须与历史版本同源（Win32_PhysicalMedia，其次 Win32_DiskDrive），否则老用户升级后设备ID会变化
 """
 
 from __future__ import annotations
@@ -12,6 +14,7 @@ from __future__ import annotations
 import os
 import re
 import subprocess
+import threading
 from typing import Optional, List
 
 
@@ -34,13 +37,17 @@ def _run_cmd(cmd: List[str]) -> str:
         return ""
 
 
+_WS_RE = re.compile(r"\s+")
+# 常见的无意义序列号（小写比较）
+_BAD_SERIALS = frozenset({"none", "null", "unknown", "n/a", "na"})
+
+
 def _clean_serial(s: str) -> str:
     if not s:
         return ""
-    s = s.strip()
     # 去掉常见的空白/无意义值
-    s = re.sub(r"\s+", "", s)
-    if s.lower() in {"none", "null", "unknown", "n/a", "na"}:
+    s = _WS_RE.sub("", s)
+    if s.lower() in _BAD_SERIALS:
         return ""
     return s
 
@@ -53,22 +60,155 @@ def _first_nonempty(lines: List[str]) -> str:
     return ""
 
 
-def get_motherboard_serial() -> str:
-    """获取主板序列号（Win32_BaseBoard.SerialNumber）"""
+def _smbios_string(data: bytes, struct_type: int, field_offset: int) -> str:
+    """
+    从 RawSMBIOSData（GetSystemFirmwareTable('RSMB') 的返回）中取第一个 struct_type 结构
+    在 field_offset 处引用的字符串（字符串编号从 1 开始，0 表示无）。
+    """
+    if len(data) < 8:
+        return ""
+    length = int.from_bytes(data[4:8], "little")
+    table = data[8:8 + length]
+    n = len(table)
+    i = 0
+    while i + 4 <= n:
+        stype = table[i]
+        slen = table[i + 1]
+        if slen < 4:
+            break
+        # 格式化区之后是以双 NUL 结尾的字符串集合
+        end = table.find(b"\x00\x00", i + slen)
+        if end < 0:
+            break
+        if stype == struct_type:
+            if slen <= field_offset:
+                return ""
+            idx = table[i + field_offset]
+            if not idx:
+                return ""
+            strings = table[i + slen:end].split(b"\x00")
+            if idx > len(strings):
+                return ""
+            return strings[idx - 1].decode("ascii", errors="ignore").strip()
+        if stype == 127:  # End-of-table
+            break
+        i = end + 2
+    return ""
+
+
+def _firmware_baseboard_serial() -> str:
+    """进程内读取 SMBIOS 类型 2（Baseboard）的序列号，与 Win32_BaseBoard.SerialNumber 同源"""
+    try:
+        import ctypes
+
+        k32 = ctypes.windll.kernel32
+        rsmb = 0x52534D42  # 'RSMB'
+        size = k32.GetSystemFirmwareTable(rsmb, 0, None, 0)
+        if not size:
+            return ""
+        buf = ctypes.create_string_buffer(size)
+        if k32.GetSystemFirmwareTable(rsmb, 0, buf, size) != size:
+            return ""
+        return _clean_serial(_smbios_string(buf.raw, 2, 0x07))
+    except Exception:
+        return ""
+
+
+def _wmi_first_serial(services, wmi_class: str) -> str:
+    """取 WMI 类第一个实例的 SerialNumber（与 Select-Object -First 1 -ExpandProperty SerialNumber 一致）"""
+    try:
+        result = services.ExecQuery(f"SELECT SerialNumber FROM {wmi_class}")
+        if not result.Count:
+            return ""
+        value = result.ItemIndex(0).SerialNumber
+        return str(value) if value is not None else ""
+    except Exception:
+        return ""
+
+
+def _wmi_disk_serial() -> Optional[str]:
+    """
+    进程内 COM 查询 WMI 的硬盘序列号：Win32_PhysicalMedia，为空时 Win32_DiskDrive（与 PowerShell 查询同源）。
+    COM/WMI 不可用时返回 None（调用方继续走子进程降级）。
+    """
+    try:
+        import comtypes
+        import comtypes.client
+    except Exception:
+        return None
+
+    # 在调用线程上初始化 COM（该线程已初始化过时只增加一次引用计数，finally 中对应释放）
+    initialized = False
+    try:
+        comtypes.CoInitializeEx()
+        initialized = True
+    except Exception:
+        pass
+    locator = services = None
+    try:
+        locator = comtypes.client.CreateObject("WbemScripting.SWbemLocator", dynamic=True)
+        services = locator.ConnectServer(".", "root\\cimv2")
+        v = _clean_serial(_wmi_first_serial(services, "Win32_PhysicalMedia"))
+        if v:
+            return v
+        return _clean_serial(_wmi_first_serial(services, "Win32_DiskDrive"))
+    except Exception:
+        return None
+    finally:
+        # 先释放 COM 代理对象，再反初始化本线程的 COM（否则对象会在套间销毁后才被释放）
+        locator = services = None
+        if initialized:
+            try:
+                comtypes.CoUninitialize()
+            except Exception:
+                pass
+
+
+# 一次 PowerShell 同时查询主板与两个硬盘类的序列号，三段输出以 '---' 分隔；
+# PhysicalMedia 为空/无意义时改用 DiskDrive 的判断放在 Python 侧（与 _clean_serial 的规则一致）
+_PS_SERIALS_SCRIPT = (
+    "$mb=(Get-CimInstance Win32_BaseBoard | Select-Object -First 1 -ExpandProperty SerialNumber); "
+    "$pm=(Get-CimInstance Win32_PhysicalMedia | Select-Object -First 1 -ExpandProperty SerialNumber); "
+    "$dd=(Get-CimInstance Win32_DiskDrive | Select-Object -First 1 -ExpandProperty SerialNumber); "
+    "Write-Output $mb; Write-Output '---'; Write-Output $pm; Write-Output '---'; Write-Output $dd"
+)
+_ps_serials_lock = threading.Lock()
+_ps_serials: Optional[tuple[str, str]] = None
+
+
+def _powershell_serials() -> tuple[str, str]:
+    """(主板序列号, 硬盘序列号)：只启动一次 PowerShell，结果供两个查询共用"""
+    global _ps_serials
+    with _ps_serials_lock:
+        if _ps_serials is None:
+            out = _run_cmd(
+                ["powershell", "-NoProfile", "-NonInteractive", "-WindowStyle", "Hidden",
+                 "-Command", _PS_SERIALS_SCRIPT]
+            )
+            parts = out.split("---")
+            if len(parts) != 3:
+                _ps_serials = ("", "")
+            else:
+                mb_part, pm_part, dd_part = parts
+                _ps_serials = (
+                    _first_nonempty(mb_part.splitlines()),
+                    _first_nonempty(pm_part.splitlines()) or _first_nonempty(dd_part.splitlines()),
+                )
+        return _ps_serials
+
+
+def _query_motherboard_serial() -> str:
+    """查询主板序列号（Win32_BaseBoard.SerialNumber）"""
     if os.name != "nt":
         return ""
 
-    # PowerShell CIM（推荐）
-    out = _run_cmd(
-        [
-            "powershell",
-            "-NoProfile",
-            "-NonInteractive",
-            "-Command",
-            "(Get-CimInstance Win32_BaseBoard | Select-Object -First 1 -ExpandProperty SerialNumber)",
-        ]
-    )
-    v = _clean_serial(out)
+    # 进程内读取 SMBIOS（最快，无子进程）
+    v = _firmware_baseboard_serial()
+    if v:
+        return v
+
+    # PowerShell CIM（与硬盘序列号共用一次调用）
+    v = _powershell_serials()[0]
     if v:
         return v
 
@@ -84,62 +224,81 @@ def get_motherboard_serial() -> str:
     return ""
 
 
-def get_disk_serial() -> str:
+def _query_disk_serial() -> str:
     """
-    获取硬盘序列号
+    查询硬盘序列号
     - 优先 Win32_PhysicalMedia.SerialNumber（可能为空/带空格）
     - 再尝试 Win32_DiskDrive.SerialNumber
     """
     if os.name != "nt":
         return ""
 
-    # PowerShell CIM（PhysicalMedia）
-    out = _run_cmd(
-        [
-            "powershell",
-            "-NoProfile",
-            "-NonInteractive",
-            "-Command",
-            "(Get-CimInstance Win32_PhysicalMedia | Select-Object -First 1 -ExpandProperty SerialNumber)",
-        ]
-    )
-    v = _clean_serial(out)
+    # 进程内 COM 查询 WMI（与 PowerShell CIM 同源，无子进程）；
+    # 查询成功但两个类都为空时，PowerShell 也只会得到同样的空结果，直接跳到 wmic
+    v = _wmi_disk_serial()
     if v:
         return v
 
-    # PowerShell CIM（DiskDrive）
-    out = _run_cmd(
-        [
-            "powershell",
-            "-NoProfile",
-            "-NonInteractive",
-            "-Command",
-            "(Get-CimInstance Win32_DiskDrive | Select-Object -First 1 -ExpandProperty SerialNumber)",
-        ]
-    )
-    v = _clean_serial(out)
-    if v:
-        return v
+    if v is None:
+        # PowerShell CIM（PhysicalMedia，为空时 DiskDrive；与主板序列号共用一次调用）
+        v = _powershell_serials()[1]
+        if v:
+            return v
 
     # wmic 降级
     out = _run_cmd(["wmic", "diskdrive", "get", "serialnumber"])
     if out:
         lines = [ln.strip() for ln in out.splitlines() if ln.strip()]
-        if len(lines) >= 2:
-            return _first_nonempty(lines[1:])
-        return _first_nonempty(lines)
+        v = _first_nonempty(lines[1:]) if len(lines) >= 2 else _first_nonempty(lines)
+        if v:
+            return v
 
     return ""
 
 
+# 进程内缓存：只缓存取到的非空序列号；取不到（含超时等偶发失败）时下次调用会重新查询
+_motherboard_serial_cache: str = ""
+_disk_serial_cache: str = ""
+
+
+def get_motherboard_serial() -> str:
+    """获取主板序列号（Win32_BaseBoard.SerialNumber），取到后按进程缓存"""
+    global _motherboard_serial_cache
+    if not _motherboard_serial_cache:
+        _motherboard_serial_cache = _query_motherboard_serial()
+    return _motherboard_serial_cache
+
+
+def get_disk_serial() -> str:
+    """获取硬盘序列号（Win32_PhysicalMedia，其次 Win32_DiskDrive），取到后按进程缓存"""
+    global _disk_serial_cache
+    if not _disk_serial_cache:
+        _disk_serial_cache = _query_disk_serial()
+    return _disk_serial_cache
+
+
+def _compute_hardware_id() -> str:
+    """主板序列号 + 硬盘序列号；两项都已缓存时直接拼接，否则查询缺的项"""
+    if _motherboard_serial_cache and _disk_serial_cache:
+        return _clean_serial(_motherboard_serial_cache + _disk_serial_cache)
+
+    # 上次的 PowerShell 结果可能是偶发失败得到的空值：每次重新查询前清掉，本次查询内两项仍共用一次调用
+    global _ps_serials
+    with _ps_serials_lock:
+        _ps_serials = None
+
+    mb = get_motherboard_serial()
+    disk = get_disk_serial()
+    return _clean_serial(mb + disk)
+
+
 def get_hardware_id(fallback: Optional[str] = None) -> str:
     """
     生成设备ID：主板序列号 + 硬盘序列号
     - 若某项取不到，会用空字符串拼接；两者都取不到则返回 fallback 或空。
+    - 取到的序列号按进程缓存，重复调用不会再次查询硬件/启动子进程；取不到的项下次调用会重试。
     """
-    mb = get_motherboard_serial()
-    disk = get_disk_serial()
-    hwid = _clean_serial(mb + disk)
+    hwid = _compute_hardware_id()
     if hwid:
         return hwid
     return fallback or ""
@@ -3,14 +3,83 @@ import os
 import shutil
 import subprocess
 from pathlib import Path
-from PyQt6.QtWidgets import QMessageBox, QFileDialog, QProgressDialog
+from PyQt6.QtWidgets import QApplication, QMessageBox, QFileDialog, QProgressDialog
 from PyQt6.QtCore import Qt
 
+# 安装时不复制的顶层条目
+_INSTALL_SKIP_NAMES = frozenset({"logs", "installed.tag"})
+
+
+def _tree_size(root, skip_names=frozenset()) -> int:
+    """统计目录下所有文件的总字节数（os.scandir：DirEntry 的类型/大小在 Windows 上由目录枚举直接给出）"""
+    total = 0
+    stack = [(os.fspath(root), True)]
+    while stack:
+        path, top = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if top and entry.name in skip_names:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, False))
+                        elif entry.is_file():
+                            total += entry.stat().st_size
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+    return total
+
+
+def _dir_is_empty(path) -> bool:
+    with os.scandir(path) as it:
+        return next(it, None) is None
+
+
+# PowerShell 创建快捷方式的命令：路径通过环境变量传入，不拼进命令文本（避免引号/特殊字符问题）
+_LNK_PS_SCRIPT = (
+    "$WshShell = New-Object -ComObject WScript.Shell; "
+    "$Shortcut = $WshShell.CreateShortcut($env:ST_LNK_PATH); "
+    "$Shortcut.TargetPath = $env:ST_LNK_TARGET; "
+    "$Shortcut.WorkingDirectory = Split-Path -Parent $env:ST_LNK_TARGET; "
+    "$Shortcut.IconLocation = $env:ST_LNK_TARGET; "
+    "$Shortcut.Save()"
+)
+
+
+class _InstallCancelled(Exception):
+    """用户在进度对话框中点击了取消"""
+
+
+def _copy_file(src, dst):
+    """copytree 的 copy_function：Windows 上走系统复制引擎 CopyFileExW（保留属性与时间戳），失败再用 copy2"""
+    if os.name == "nt":
+        try:
+            import ctypes
+            if ctypes.windll.kernel32.CopyFileExW(str(src), str(dst), None, None, None, 0):
+                return dst
+        except Exception:
+            pass
+    return shutil.copy2(src, dst)
+
+
 class Installer:
     def __init__(self):
         self.is_frozen = getattr(sys, 'frozen', False)
         self.current_exe = Path(sys.executable)
         self.resource_root = Path(getattr(sys, '_MEIPASS', Path(__file__).parent.parent.parent))
+        # WScript.Shell COM 对象：首次创建快捷方式时创建，桌面/开始菜单快捷方式共用
+        self._wsh_shell = None
+        # 程序目录下的 ConfigManager：首次需要时创建并复用
+        self._config = None
+
+    def _get_config(self):
+        if self._config is None:
+            from config import ConfigManager
+            self._config = ConfigManager(str(self.current_exe.parent))
+        return self._config
         
     def is_shortcut_hint_skipped(self) -> bool:
         """检查是否已经提示过创建快捷方式"""
@@ -20,9 +89,7 @@ class Installer:
             
         # 2. 检查配置文件
         try:
-            from config import ConfigManager
-            config = ConfigManager(str(self.current_exe.parent))
-            if config.get_bool('general', 'skip_shortcut_hint', False):
+            if self._get_config().get_bool('general', 'skip_shortcut_hint', False):
                 return True
         except Exception:
             pass
@@ -53,9 +120,7 @@ class Installer:
             
         # 2. 检查配置文件中的标记
         try:
-            from config import ConfigManager
-            config = ConfigManager(str(self.current_exe.parent))
-            if config.get_bool('general', 'skip_installation_hint', False):
+            if self._get_config().get_bool('general', 'skip_installation_hint', False):
                 return True
         except Exception:
             pass
@@ -86,9 +151,7 @@ class Installer:
             )
             if reply == QMessageBox.StandardButton.Yes:
                 try:
-                    from config import ConfigManager
-                    config = ConfigManager(str(self.current_exe.parent))
-                    config.set('general', 'skip_installation_hint', 'true')
+                    self._get_config().set('general', 'skip_installation_hint', 'true')
                 except Exception:
                     pass
             return False
@@ -96,7 +159,7 @@ class Installer:
         dest_path = Path(dest_dir)
         try:
             # 如果目录不为空，提醒用户
-            if dest_path.exists() and any(dest_path.iterdir()):
+            if dest_path.exists() and not _dir_is_empty(dest_path):
                 reply = QMessageBox.warning(
                     parent_window,
                     "目录不为空",
@@ -118,22 +181,47 @@ class Installer:
             # 在 onedir 模式下，sys.executable 所在目录就是我们的完整运行环境
             app_source_dir = self.current_exe.parent
             
-            # 这里的逻辑改为：将源目录的所有内容复制到目标目录
-            # 排除掉已经存在的 logs 或其他不需要的文件
-            for item in app_source_dir.iterdir():
-                if item.name == "logs" or item.name == "installed.tag":
-                    continue
-                
-                dest_item = dest_path / item.name
+            # 这里的逻辑改为：将源目录的所有内容一次性复制到目标目录（已存在的目录直接覆盖合并）
+            # 排除掉顶层已经存在的 logs 或其他不需要的文件
+            def _ignore_top_level(directory, names):
+                if Path(directory) == app_source_dir:
+                    return [n for n in names if n in _INSTALL_SKIP_NAMES]
+                return []
+
+            # 按已复制字节数推进进度（10% -> 80%），并响应“取消”
+            total_bytes = _tree_size(app_source_dir, _INSTALL_SKIP_NAMES)
+            copied_bytes = 0
+
+            def _copy_with_progress(src, dst):
+                nonlocal copied_bytes
+                if progress.wasCanceled():
+                    raise _InstallCancelled()
+                result = _copy_file(src, dst)
                 try:
-                    if item.is_dir():
-                        if dest_item.exists():
-                            shutil.rmtree(dest_item)
-                        shutil.copytree(item, dest_item)
-                    else:
-                        shutil.copy2(item, dest_item)
-                except Exception as e:
-                    print(f"Skipping {item.name}: {e}")
+                    copied_bytes += os.path.getsize(src)
+                except OSError:
+                    pass
+                if total_bytes > 0:
+                    progress.setValue(10 + int(min(copied_bytes, total_bytes) * 70 / total_bytes))
+                QApplication.processEvents()
+                return result
+
+            try:
+                shutil.copytree(
+                    app_source_dir,
+                    dest_path,
+                    dirs_exist_ok=True,
+                    ignore=_ignore_top_level,
+                    copy_function=_copy_with_progress,
+                )
+            except _InstallCancelled:
+                progress.close()
+                QMessageBox.information(parent_window, "安装已取消", "安装已取消，已复制的文件保留在目标目录中。")
+                return False
+            except shutil.Error as e:
+                # copytree 会先复制完其余文件，再汇总抛出失败项
+                for src, _dst, why in e.args[0] if e.args and isinstance(e.args[0], list) else []:
+                    print(f"Skipping {src}: {why}")
             
             target_exe = dest_path / self.current_exe.name
             progress.setValue(80)
@@ -169,17 +257,31 @@ class Installer:
         start_menu = Path(os.environ["APPDATA"]) / "Microsoft/Windows/Start Menu/Programs"
         self._create_lnk(target_path, start_menu / f"{name}.lnk")
 
+    def _get_wsh_shell(self):
+        if self._wsh_shell is None:
+            import comtypes.client
+            self._wsh_shell = comtypes.client.CreateObject("WScript.Shell", dynamic=True)
+        return self._wsh_shell
+
     def _create_lnk(self, target_path: Path, shortcut_path: Path):
-        """通用的 .lnk 创建函数 (PowerShell)"""
+        """通用的 .lnk 创建函数（进程内 COM，失败时降级到 PowerShell）"""
+        try:
+            shortcut = self._get_wsh_shell().CreateShortcut(str(shortcut_path))
+            shortcut.TargetPath = str(target_path)
+            shortcut.WorkingDirectory = str(target_path.parent)
+            shortcut.IconLocation = str(target_path)
+            shortcut.Save()
+            return
+        except Exception:
+            pass
+        self._create_lnk_powershell(target_path, shortcut_path)
+
+    def _create_lnk_powershell(self, target_path: Path, shortcut_path: Path):
+        """.lnk 创建函数 (PowerShell)"""
         try:
-            ps_script = f"""
-            $WshShell = New-Object -ComObject WScript.Shell
-            $Shortcut = $WshShell.CreateShortcut("{shortcut_path}")
-            $Shortcut.TargetPath = "{target_path}"
-            $Shortcut.WorkingDirectory = "{target_path.parent}"
-            $Shortcut.IconLocation = "{target_path}"
-            $Shortcut.Save()
-            """
+            env = dict(os.environ)
+            env["ST_LNK_PATH"] = str(shortcut_path)
+            env["ST_LNK_TARGET"] = str(target_path)
             startupinfo = None
             creationflags = 0
             if os.name == "nt":
@@ -194,7 +296,8 @@ class Installer:
                 except Exception:
                     pass
             subprocess.run(
-                ["powershell", "-Command", ps_script],
+                ["powershell", "-NoProfile", "-NonInteractive", "-WindowStyle", "Hidden", "-Command", _LNK_PS_SCRIPT],
+                env=env,
                 capture_output=True,
                 startupinfo=startupinfo,
                 creationflags=creationflags,
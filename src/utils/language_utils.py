@@ -2,8 +2,189 @@
 语言相关工具函数
 """
 import re
+from functools import lru_cache
 from typing import Optional, List
 
+import numpy as np
+
+
+# 文字类别下标（计数数组的下标；各类互不重叠，日语 = 假名 + 汉字 在 _classify 中合成）
+_S_OTHER = 0
+_S_KANA = 1
+_S_HANGUL = 2
+_S_HAN = 3
+_S_CYRILLIC = 4
+_S_GREEK = 5
+_S_HEBREW = 6
+_S_ARABIC = 7
+_S_DEVANAGARI = 8
+_S_THAI = 9
+_S_LATIN = 10
+_NUM_SCRIPTS = 11
+
+# 各类文字的码位范围（闭区间）：(类别下标, 起始, 结束)
+_SCRIPT_RANGES = (
+    (_S_KANA, 0x3040, 0x30FF),
+    (_S_HANGUL, 0xAC00, 0xD7A3),
+    (_S_HAN, 0x4E00, 0x9FFF),
+    (_S_CYRILLIC, 0x0400, 0x04FF),  # 俄语等西里尔字母
+    (_S_GREEK, 0x0370, 0x03FF),  # 希腊字母
+    (_S_HEBREW, 0x0590, 0x05FF),  # 希伯来字母
+    (_S_ARABIC, 0x0600, 0x06FF),  # 阿拉伯字母
+    (_S_DEVANAGARI, 0x0900, 0x097F),  # 天城文（印地语等）
+    (_S_THAI, 0x0E00, 0x0E7F),  # 泰语
+    (_S_LATIN, 0x41, 0x5A),
+    (_S_LATIN, 0x61, 0x7A),
+)
+
+# 非 ASCII 部分的范围（ASCII 拉丁字母在计数循环里单独走快速分支）
+_NON_ASCII_RANGES = tuple(r for r in _SCRIPT_RANGES if r[0] != _S_LATIN)
+_ASCII_LETTERS = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+
+@lru_cache(maxsize=1)
+def _script_lut():
+    """BMP 码位 -> 文字类别下标 的查找表（首次使用时构建一次，64KB，之后复用）"""
+    lut = np.zeros(0x10000, dtype=np.uint8)
+    for idx, lo, hi in _SCRIPT_RANGES:
+        lut[lo:hi + 1] = idx
+    return lut
+
+
+def _count_scripts_np(text: str) -> List[int]:
+    """numpy 向量化计数：码位查表得到类别下标，再用一次 bincount 得到各类数量"""
+    arr = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    # BMP 以外的码位归入 0（其他）
+    arr_bmp = np.where(arr < 0x10000, arr, 0)
+    ids = _script_lut()[arr_bmp]
+    return np.bincount(ids, minlength=_NUM_SCRIPTS).tolist()
+
+
+def _classify(counts, total: int) -> str:
+    """根据各类文字的数量判定语言（优先级：中日韩俄希腊希伯来阿拉伯印地泰语英语）"""
+    if total <= 0:
+        return 'auto'
+    # 阈值预先乘好，比较时不再逐项做除法
+    limit = 0.3 * total
+
+    if counts[_S_KANA] + counts[_S_HAN] > limit:
+        return 'ja'
+    elif counts[_S_HANGUL] > limit:
+        return 'ko'
+    elif counts[_S_HAN] > limit:
+        return 'zh'
+    elif counts[_S_CYRILLIC] > limit:  # 俄语检测
+        return 'ru'
+    elif counts[_S_GREEK] > limit:  # 希腊语
+        return 'el'
+    elif counts[_S_HEBREW] > limit:  # 希伯来语
+        return 'he'
+    elif counts[_S_ARABIC] > limit:  # 阿拉伯语
+        return 'ar'
+    elif counts[_S_DEVANAGARI] > limit:  # 印地语
+        return 'hi'
+    elif counts[_S_THAI] > limit:  # 泰语
+        return 'th'
+    elif counts[_S_LATIN] > 0.5 * total:
+        return 'en'
+    return 'auto'
+
+
+# 与 _classify 相同的判定优先级中，日语之后、英语之前的单一类别语言：(类别下标, 语言)
+_LADDER_SINGLE = (
+    (_S_HANGUL, 'ko'),
+    (_S_HAN, 'zh'),
+    (_S_CYRILLIC, 'ru'),
+    (_S_GREEK, 'el'),
+    (_S_HEBREW, 'he'),
+    (_S_ARABIC, 'ar'),
+    (_S_DEVANAGARI, 'hi'),
+    (_S_THAI, 'th'),
+)
+
+# 不超过该长度的文本走可提前结束的逐字符扫描
+_SHORT_TEXT_MAX = 256
+
+
+def _settled(counts, remaining: int, total: int) -> Optional[str]:
+    """按 _classify 的优先级检查：某语言已超过阈值，且更高优先级的语言即使剩余字符全计入也无法超过阈值时，结果已确定"""
+    limit = 0.3 * total
+    n = counts[_S_KANA] + counts[_S_HAN]
+    if n > limit:
+        return 'ja'
+    if n + remaining > limit:
+        return None
+    for idx, lang in _LADDER_SINGLE:
+        n = counts[idx]
+        if n > limit:
+            return lang
+        if n + remaining > limit:
+            return None
+    n = counts[_S_LATIN]
+    if n > 0.5 * total:
+        return 'en'
+    if n + remaining > 0.5 * total:
+        return None
+    # 所有语言都已不可能超过阈值
+    return 'auto'
+
+
+def _detect_short(text: str, total: int) -> str:
+    """短文本检测：边扫描边计数，结果确定即提前返回（结果与 _classify 完全一致）"""
+    if text.isascii():
+        # 纯 ASCII 只可能是英语或无法判断：拉丁字母数量在 C 层一次算出
+        data = text.encode('ascii')
+        latin = total - len(data.translate(None, _ASCII_LETTERS))
+        return 'en' if latin > 0.5 * total else 'auto'
+    counts = [0] * _NUM_SCRIPTS
+    ranges = _NON_ASCII_RANGES
+    limit = 0.3 * total
+    jp = 0
+    # 其他语言要确定，日语必须已不可能超过阈值（剩余字符数 <= 阈值），
+    # 因此前 head 个字符只计数、只检查日语，末尾一段才逐字符检查结果是否已确定
+    head = max(0, total - int(limit) - 1)
+    latin = 0
+    for c in text[:head]:
+        o = ord(c)
+        if o < 0x80:
+            if 0x61 <= o <= 0x7A or 0x41 <= o <= 0x5A:
+                latin += 1
+            continue
+        for idx, lo, hi in ranges:
+            if lo <= o <= hi:
+                counts[idx] += 1
+                # 日语优先级最高，一旦超过阈值立即确定
+                if idx == _S_KANA or idx == _S_HAN:
+                    jp += 1
+                    if jp > limit:
+                        return 'ja'
+                break
+    counts[_S_LATIN] = latin
+    remaining = total - head
+    for c in text[head:]:
+        remaining -= 1
+        o = ord(c)
+        if o < 0x80:
+            if not (0x61 <= o <= 0x7A or 0x41 <= o <= 0x5A):
+                continue
+            idx = _S_LATIN
+        else:
+            for idx, lo, hi in ranges:
+                if lo <= o <= hi:
+                    break
+            else:
+                continue
+            if idx == _S_KANA or idx == _S_HAN:
+                jp += 1
+                if jp > limit:
+                    return 'ja'
+        counts[idx] += 1
+        if jp + remaining <= limit:
+            lang = _settled(counts, remaining, total)
+            if lang is not None:
+                return lang
+    return _classify(counts, total)
+
 
 def detect_language(text: str) -> str:
     """
@@ -18,55 +199,13 @@ def detect_language(text: str) -> str:
     if not text.strip():
         return 'auto'
     
-    # 基于字符范围检测语言
-    japanese_chars = sum(1 for c in text if ('\u3040' <= c <= '\u30ff') or ('\u4e00' <= c <= '\u9fff'))
-    korean_chars = sum(1 for c in text if '\uac00' <= c <= '\ud7a3')
-    chinese_chars = sum(1 for c in text if '\u4e00' <= c <= '\u9fff')
-    cyrillic_chars = sum(1 for c in text if '\u0400' <= c <= '\u04ff')  # 俄语等西里尔字母
-    greek_chars = sum(1 for c in text if '\u0370' <= c <= '\u03ff')  # 希腊字母
-    hebrew_chars = sum(1 for c in text if '\u0590' <= c <= '\u05ff')  # 希伯来字母
-    arabic_chars = sum(1 for c in text if '\u0600' <= c <= '\u06ff')  # 阿拉伯字母
-    devanagari_chars = sum(1 for c in text if '\u0900' <= c <= '\u097f')  # 天城文（印地语等）
-    thai_chars = sum(1 for c in text if '\u0e00' <= c <= '\u0e7f')  # 泰语
-    latin_chars = sum(1 for c in text if 'a' <= c.lower() <= 'z')
-    
     total_chars = len(text)
+    # 短文本（大多数 OCR 气泡）逐字符扫描，结果确定即提前返回
+    if total_chars <= _SHORT_TEXT_MAX:
+        return _detect_short(text, total_chars)
     
-    if total_chars > 0:
-        jp_ratio = japanese_chars / total_chars
-        ko_ratio = korean_chars / total_chars
-        cn_ratio = chinese_chars / total_chars
-        ru_ratio = cyrillic_chars / total_chars  # 俄语比例
-        el_ratio = greek_chars / total_chars  # 希腊语
-        he_ratio = hebrew_chars / total_chars  # 希伯来语
-        ar_ratio = arabic_chars / total_chars  # 阿拉伯语
-        hi_ratio = devanagari_chars / total_chars  # 印地语
-        th_ratio = thai_chars / total_chars  # 泰语
-        en_ratio = latin_chars / total_chars
-        
-        # 检测优先级：中日韩俄希腊希伯来阿拉伯印地泰语英语
-        if jp_ratio > 0.3:
-            return 'ja'
-        elif ko_ratio > 0.3:
-            return 'ko'
-        elif cn_ratio > 0.3:
-            return 'zh'
-        elif ru_ratio > 0.3:  # 俄语检测
-            return 'ru'
-        elif el_ratio > 0.3:  # 希腊语
-            return 'el'
-        elif he_ratio > 0.3:  # 希伯来语
-            return 'he'
-        elif ar_ratio > 0.3:  # 阿拉伯语
-            return 'ar'
-        elif hi_ratio > 0.3:  # 印地语
-            return 'hi'
-        elif th_ratio > 0.3:  # 泰语
-            return 'th'
-        elif en_ratio > 0.5:
-            return 'en'
-    
-    return 'auto'
+    # 长文本：numpy 查表计数，再按字符范围判定语言
+    return _classify(_count_scripts_np(text), total_chars)
 
 
 def is_cjk_language(language: Optional[str]) -> bool:
@@ -80,11 +219,23 @@ def is_cjk_language(language: Optional[str]) -> bool:
     if not language:
         return False
 
-    lang_codes = [c.strip().lower() for c in str(language).split('+') if str(c).strip()]
-    if not lang_codes:
-        return False
+    # 单遍遍历，遇到第一个非 CJK 代码立即返回；全是空片段时视为非 CJK
+    seen = False
+    for code in str(language).split('+'):
+        code = code.strip()
+        if not code:
+            continue
+        if not is_cjk_lang_code(code):
+            return False
+        seen = True
+    return seen
 
-    return all(is_cjk_lang_code(code) for code in lang_codes)
+
+# CJK 语言代码：精确匹配集合 + 前缀（覆盖 chi_sim_vert / jpn_vert / zh-cn 等变体）
+_CJK_EXACT = frozenset({
+    'jpn', 'japanese', 'kor', 'korean', 'chi', 'chinese', 'zh', 'chi_sim', 'chi_tra', 'ja', 'ko',
+})
+_CJK_PREFIXES = ('chi', 'zh', 'jpn', 'kor', 'japanese', 'korean')
 
 
 def is_cjk_lang_code(code: str) -> bool:
@@ -92,10 +243,30 @@ def is_cjk_lang_code(code: str) -> bool:
     判断单个语言代码是否属于 CJK（中/日/韩）。
     """
     code = (code or "").lower()
-    # 注意：这里是“语言代码包含关系”，例如 chi_sim / chi_tra / jpn / kor / zh 等
-    return any(x in code for x in ['jpn', 'japanese', 'kor', 'korean', 'chi', 'chinese', 'zh', 'chi_sim', 'chi_tra'])
+    # tesseract 的脚本模型写作 script/Japanese 这种形式，去掉前缀再判断
+    if code.startswith('script/'):
+        code = code[7:]
+    return code in _CJK_EXACT or code.startswith(_CJK_PREFIXES)
 
 
+# 常见别名映射（模块级常量，只读）
+_LANG_ALIASES = {
+    'chinese': 'zh',
+    'english': 'en',
+    'japanese': 'ja',
+    'korean': 'ko',
+    'russian': 'ru',
+    'zh-cn': 'zh',
+    'zh-tw': 'zh',
+    'chi_sim': 'zh',
+    'chi_tra': 'zh',
+    'jpn': 'ja',
+    'kor': 'ko',
+    'rus': 'ru',
+    'eng': 'en',
+}
+
+
 def normalize_lang_key(key: str) -> str:
     """
     规范化语言代码
@@ -109,26 +280,8 @@ def normalize_lang_key(key: str) -> str:
     if not key:
         return 'auto'
     
-    key = str(key).strip().lower()
-    
-    # 常见别名映射
-    lang_aliases = {
-        'chinese': 'zh',
-        'english': 'en',
-        'japanese': 'ja',
-        'korean': 'ko',
-        'russian': 'ru',
-        'zh-cn': 'zh',
-        'zh-tw': 'zh',
-        'chi_sim': 'zh',
-        'chi_tra': 'zh',
-        'jpn': 'ja',
-        'kor': 'ko',
-        'rus': 'ru',
-        'eng': 'en',
-    }
-    
-    return lang_aliases.get(key, key)
+    key = key.strip().lower() if isinstance(key, str) else str(key).strip().lower()
+    return _LANG_ALIASES.get(key, key)
 
 
 def normalize_quick_language_keys(keys: List[str]) -> List[str]:
@@ -141,8 +294,4 @@ def normalize_quick_language_keys(keys: List[str]) -> List[str]:
     Returns:
         规范化后的语言代码列表，保持原始长度和顺序
     """
-    normalized = []
-    for key in keys:
-        normalized_key = normalize_lang_key(key)
-        normalized.append(normalized_key)
-    return normalized
+    return [normalize_lang_key(key) for key in keys]
@@ -27,29 +27,40 @@ class GpuStats:
     reserved_bytes: Optional[int]
 
 
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_bytes(num_bytes: Optional[float]) -> str:
     if num_bytes is None:
         return "-"
     try:
         n = float(num_bytes)
+        # 单位下标 = log2(n) // 10，直接由 bit_length 得到，不再循环除 1024
+        i = min(len(_BYTE_UNITS) - 1, (int(n).bit_length() - 1) // 10) if n >= 1024 else 0
     except Exception:
         return "-"
-    units = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while n >= 1024 and i < len(units) - 1:
-        n /= 1024.0
-        i += 1
     if i == 0:
-        return f"{int(n)} {units[i]}"
-    return f"{n:.1f} {units[i]}"
+        return f"{int(n)} {_BYTE_UNITS[0]}"
+    return f"{n / (1 << (10 * i)):.1f} {_BYTE_UNITS[i]}"
+
+
+# psutil.Process 句柄缓存：None=未初始化，False=psutil 不可用
+# （复用同一个句柄也让 cpu_percent 的两次采样落在同一对象上）
+_PROC_CACHE = None
+
+# GPU 静态信息缓存（进程内不会变化）：None=未初始化，否则为 (available, device_name, total_bytes)
+_GPU_STATIC = None
 
 
 def _try_get_psutil_process():
-    try:
-        import psutil  # type: ignore
-        return psutil.Process()
-    except Exception:
-        return None
+    global _PROC_CACHE
+    if _PROC_CACHE is None:
+        try:
+            import psutil  # type: ignore
+            _PROC_CACHE = psutil.Process()
+        except Exception:
+            _PROC_CACHE = False
+    return _PROC_CACHE or None
 
 
 def init_process_cpu_sampler() -> None:
@@ -88,9 +99,14 @@ def get_gpu_stats() -> GpuStats:
     - allocated: torch 已分配给张量/缓存的显存
     - reserved: torch CUDA caching allocator 保留的显存
     """
+    global _GPU_STATIC
+    if _GPU_STATIC is not None and not _GPU_STATIC[0]:
+        return GpuStats(False, None, None, None, None)
+
     try:
         import torch  # type: ignore
     except Exception:
+        _GPU_STATIC = (False, None, None)
         return GpuStats(
             available=False,
             device_name=None,
@@ -100,19 +116,23 @@ def get_gpu_stats() -> GpuStats:
         )
 
     try:
-        if not torch.cuda.is_available():
-            return GpuStats(False, None, None, None, None)
         dev = 0
-        name = None
-        total = None
-        try:
-            name = torch.cuda.get_device_name(dev)
-        except Exception:
+        if _GPU_STATIC is None:
+            if not torch.cuda.is_available():
+                _GPU_STATIC = (False, None, None)
+                return GpuStats(False, None, None, None, None)
             name = None
-        try:
-            total = int(torch.cuda.get_device_properties(dev).total_memory)
-        except Exception:
             total = None
+            try:
+                name = torch.cuda.get_device_name(dev)
+            except Exception:
+                name = None
+            try:
+                total = int(torch.cuda.get_device_properties(dev).total_memory)
+            except Exception:
+                total = None
+            _GPU_STATIC = (True, name, total)
+        _, name, total = _GPU_STATIC
         try:
             allocated = int(torch.cuda.memory_allocated(dev))
         except Exception:
@@ -14,9 +14,16 @@ from pathlib import Path
 from typing import Optional, Tuple, List
 from urllib.parse import urljoin
 
-import requests
 from PyQt6.QtCore import QThread, pyqtSignal
 
+# requests 较重，放到实际用到的地方再导入（TesseractManager 在启动阶段就会被导入）
+
+
+# 匹配类似 tesseract-ocr-w64-setup-5.3.3.20231005.exe 的文件名（直接匹配原始字节，无需解码整页 HTML）
+_INSTALLER_NAME_RE = re.compile(rb"tesseract-ocr-w64-setup-[\d\.]+(?:\.\d+)?\.exe")
+# 流式解析时，保留上一块末尾这么多字节，避免文件名被切在两块之间
+_INSTALLER_NAME_OVERLAP = 128
+
 
 class TesseractManager:
     """Tesseract-OCR 管理器"""
@@ -45,8 +52,21 @@ class TesseractManager:
         self.language_packs = ['eng', 'jpn', 'kor']
         self.tessdata_base_url = "https://github.com/tesseract-ocr/tessdata/raw/main/"
     
+    @staticmethod
+    def _cached_path_valid() -> bool:
+        """已配置的 Tesseract 路径是否仍然存在（只查文件系统，不启动进程）"""
+        path = TesseractManager._configured_path
+        if not (TesseractManager._configured and path):
+            return False
+        try:
+            return Path(path).is_file() or shutil.which(path) is not None
+        except Exception:
+            return False
+
     def is_tesseract_available(self) -> bool:
-        """检查 Tesseract 是否可用（通过实际运行测试）"""
+        """检查 Tesseract 是否可用（通过实际运行测试；已配置成功时只检查文件是否还在）"""
+        if TesseractManager._cached_path_valid():
+            return True
         if self.configure_pytesseract():
             return True
         # 兜底检查本地文件是否存在
@@ -92,10 +112,13 @@ class TesseractManager:
             return False
         
         if TesseractManager._configured and TesseractManager._configured_path:
-            pytesseract.pytesseract.tesseract_cmd = TesseractManager._configured_path
-            if os.environ.get("TESSDATA_PREFIX"):
-                pass
-            return True
+            # 已验证过的路径仍然存在时直接复用，不再启动 --version 进程
+            if TesseractManager._cached_path_valid():
+                pytesseract.pytesseract.tesseract_cmd = TesseractManager._configured_path
+                return True
+            # 路径已失效（例如被卸载），重新探测
+            TesseractManager._configured = False
+            TesseractManager._configured_path = None
 
         # 候选 Tesseract 可执行文件路径（按优先级）
         candidates: List[Path | str] = []
@@ -113,11 +136,15 @@ class TesseractManager:
         # 3. 最后尝试 PATH
         candidates.append("tesseract")
 
+        # 先只查文件系统过滤掉不存在的候选，--version 进程只对真正存在的路径启动
+        candidates = [
+            c for c in candidates
+            if (isinstance(c, Path) and c.exists()) or (isinstance(c, str) and shutil.which(c))
+        ]
+
         for candidate in candidates:
             try:
                 cmd = str(candidate)
-                if isinstance(candidate, Path) and not candidate.exists():
-                    continue
                 
                 # 设置环境变量，防止因为找不到训练数据而报错
                 # 如果是本地路径，尝试设置 TESSDATA_PREFIX
@@ -156,22 +183,19 @@ class TesseractManager:
     def download_file(self, url: str, destination: Path) -> bool:
         """下载文件"""
         try:
+            import requests
+
             response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(destination, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        # 可以在这里添加进度回调
-                        # if total_size > 0:
-                        #     progress = (downloaded / total_size) * 100
-                        #     print(f"下载进度: {progress:.1f}%")
+            try:
+                response.raise_for_status()
+                
+                # 直接从底层流按 1MB 块拷贝到文件（C 层完成，省去逐块的 Python 循环）；
+                # decode_content 让 urllib3 处理 gzip 等传输编码
+                response.raw.decode_content = True
+                with open(destination, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+            finally:
+                response.close()
             
             return True
         except Exception as e:
@@ -187,21 +211,30 @@ class TesseractManager:
         返回：完整的安装包 URL，找不到时返回 None。
         """
         try:
-            resp = requests.get(self.tesseract_download_base, timeout=30)
-            resp.raise_for_status()
-            html = resp.text
+            import requests
 
-            # 匹配类似 tesseract-ocr-w64-setup-5.3.3.20231005.exe 的文件名
-            pattern = r"tesseract-ocr-w64-setup-[\d\.]+(?:\.\d+)?\.exe"
-            matches = re.findall(pattern, html)
-            if not matches:
-                return None
+            resp = requests.get(self.tesseract_download_base, stream=True, timeout=30)
+            try:
+                resp.raise_for_status()
 
-            # 去重并选择“最大”的版本字符串作为最新版本
-            unique = sorted(set(matches))
-            latest_name = unique[-1]
+                # 边下载边匹配，只保留“最大”的版本字符串作为最新版本（文件名为纯 ASCII，按字节比较即可）
+                latest_name = b''
+                tail = b''
+                for chunk in resp.iter_content(chunk_size=8192):
+                    if not chunk:
+                        continue
+                    buf = tail + chunk
+                    found = _INSTALLER_NAME_RE.findall(buf)
+                    if found:
+                        latest_name = max(latest_name, max(found))
+                    tail = buf[-_INSTALLER_NAME_OVERLAP:]
+            finally:
+                resp.close()
+
+            if not latest_name:
+                return None
 
-            return urljoin(self.tesseract_download_base, latest_name)
+            return urljoin(self.tesseract_download_base, latest_name.decode('ascii'))
         except Exception:
             return None
     
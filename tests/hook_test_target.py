@@ -14,6 +14,8 @@ INT = ctypes.c_int
 RECT = ctypes.c_void_p # Simplified
 
 ETO_GLYPH_INDEX = 0x0010
+GGI_MARK_NONEXISTING_GLYPHS = 0x0001
+GLYPH_BUFFER_LEN = 256  # Reused glyph index buffer size (chars)
 
 # Load DLLs
 user32 = ctypes.windll.user32
@@ -41,6 +43,14 @@ ExtTextOutW = gdi32.ExtTextOutW
 ExtTextOutW.argtypes = [HDC, INT, INT, UINT, RECT, LPCWSTR, UINT, ctypes.c_void_p]
 ExtTextOutW.restype = BOOL
 
+GetGlyphIndicesW = gdi32.GetGlyphIndicesW
+GetGlyphIndicesW.argtypes = [HDC, LPCWSTR, INT, ctypes.POINTER(ctypes.c_uint16), UINT]
+GetGlyphIndicesW.restype = UINT
+
+MultiByteToWideChar = kernel32.MultiByteToWideChar
+MultiByteToWideChar.argtypes = [UINT, UINT, ctypes.c_char_p, INT, LPCWSTR, INT]
+MultiByteToWideChar.restype = INT
+
 class TestApp:
     def __init__(self, root):
         self.root = root
@@ -48,6 +58,8 @@ class TestApp:
         self.arch = "64-bit" if self.is_64bits else "32-bit"
         self.root.title(f"Hook Test Target ({self.arch}) PID: {os.getpid()}")
         self.root.geometry("400x450")
+        # Glyph index buffer shared by every test_glyphindex call
+        self.glyph_indices = (ctypes.c_uint16 * GLYPH_BUFFER_LEN)()
         
         self.label = tk.Label(root, text=f"PID: {os.getpid()} [{self.arch}]\n1. Run ScreenTranslator\n2. Select this window/PID\n3. Click buttons below to test hooks")
         self.label.pack(pady=10)
@@ -95,15 +107,8 @@ class TestApp:
         
         # Correctly use GetGlyphIndicesW to get indices
         text = "Hello GlyphIndex"
-        count = len(text)
-        
-        # GetGlyphIndicesW definition
-        GetGlyphIndicesW = gdi32.GetGlyphIndicesW
-        GetGlyphIndicesW.argtypes = [HDC, LPCWSTR, INT, ctypes.POINTER(ctypes.c_uint16), UINT]
-        GetGlyphIndicesW.restype = UINT
-        
-        indices = (ctypes.c_uint16 * count)()
-        GGI_MARK_NONEXISTING_GLYPHS = 0x0001
+        count = min(len(text), GLYPH_BUFFER_LEN)
+        indices = self.glyph_indices
         
         # This call should be captured by hookGdiExtras
         GetGlyphIndicesW(hdc, text, count, indices, GGI_MARK_NONEXISTING_GLYPHS)
@@ -141,11 +146,6 @@ class TestApp:
         text = "Hello MultiByte"
         src = text.encode('ascii') 
         
-        # ctypes definition for MB2WC
-        MultiByteToWideChar = kernel32.MultiByteToWideChar
-        MultiByteToWideChar.argtypes = [UINT, UINT, ctypes.c_char_p, INT, LPCWSTR, INT]
-        MultiByteToWideChar.restype = INT
-        
         needed = MultiByteToWideChar(0, 0, src, len(src), None, 0)
         dst = ctypes.create_unicode_buffer(needed)
         MultiByteToWideChar(0, 0, src, len(src), dst, needed)